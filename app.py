@@ -1,30 +1,99 @@
+import time
+
+PROCESS_START = time.perf_counter()  # for time-to-first-request reporting
+
 import os
 import json
+import random
+import hmac
+import signal
+import sys
 import threading
-import time
 import uuid
-from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify, redirect, url_for, abort
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from flask import Flask, render_template, request, jsonify, redirect, url_for, abort, Response, stream_with_context
+
+from utils import clock
+from utils.archive import TaskArchive
+from utils.config import RuntimeConfig, ConfigError
+from utils.http_cache import init_http_cache, cached_page
+from utils.interprocess import InterProcessLock, LeaderLease
+from utils.progress import ProgressWriter
+from utils.race_stats import RaceStore
+from utils.profiler import TimedLock, lock_stats, sample_stacks, format_collapsed, run_cprofile, profile_scope
+from utils.scheduler import TaskScheduler
+from utils.snapshot import save_snapshot, load_snapshot, task_header, header_dict
+from utils.task_logs import TaskLogStore
+from utils.usage import UsageRollup
 
 app = Flask(__name__)
+init_http_cache(app)
 
 # --- Config & Constants ---
 TASKS_FILE = "task_data.json"
+TASKS_SNAPSHOT_FILE = "task_data.snapshot"
+TASKS_LOCK_FILE = "task_data.lock"
+SCHEDULER_LEASE_FILE = "scheduler.lease"
+DISPATCH_POLL_SECONDS = 1.0
 KEYS_FILE = "valid_keys.json"
-MAX_TASKS_PER_KEY = 3
-MAX_CONCURRENT_TASKS = 3
+TASK_STATUS_SCHEDULED = "scheduled"
 TASK_STATUS_QUEUED = "queued"
 TASK_STATUS_RUNNING = "running"
 TASK_STATUS_COMPLETED = "completed"
 TASK_STATUS_FAILED = "failed"
-TASK_PURGE_DAYS = 7
+TASK_STATUS_PAUSED = "paused"
+TASK_STATUS_CANCELLED = "cancelled"
+ACTIVE_STATUSES = [TASK_STATUS_QUEUED, TASK_STATUS_RUNNING, TASK_STATUS_PAUSED]
+FINISHED_STATUSES = [TASK_STATUS_COMPLETED, TASK_STATUS_FAILED, TASK_STATUS_CANCELLED]
+# How often the scheduler-lease holder archives finished tasks and drops expired partitions
+HOUSEKEEPING_INTERVAL_SECONDS = 60
+# How often the scheduler-lease holder saves usage rollups; other workers serve /api/usage from that file
+USAGE_SAVE_SECONDS = 10
+DRAIN_CANCEL_GRACE_SECONDS = 5  # how long cancelled runners get to exit before drain moves on
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# MAX_CONCURRENT_TASKS, MAX_TASKS_PER_KEY, TASK_PURGE_DAYS, SIMULATED_RACE_SECONDS:
+# env/.env, validated, and retunable live (see utils/config.py and /admin/config)
+config = RuntimeConfig()
+# Restart-only settings: same sources and validation, read once here.
+# Finished tasks stay in the hot store this long for the tasks page
+ARCHIVE_AFTER_MINUTES = config.ARCHIVE_AFTER_MINUTES
+DRAIN_TIMEOUT_SECONDS = config.DRAIN_TIMEOUT_SECONDS
+# Race progress is coalesced and written at most once per window; this is also how much a crash can lose
+PROGRESS_FLUSH_SECONDS = config.PROGRESS_FLUSH_SECONDS
+# A store modified this recently is re-parsed rather than cached: within one filesystem clock tick a
+# rewrite can keep the same stat signature. Linux ticks are milliseconds; raise it for coarser filesystems.
+STORE_CACHE_SLACK_NS = int(config.STORE_CACHE_SLACK_MS * 10**6)
+
+# Serialises writers of the task store across threads and worker processes.
+# Readers never take it: writes replace the file atomically, so a reader
+# always sees either the old or the new store.
+file_lock = TimedLock("file_lock", lock=InterProcessLock(TASKS_LOCK_FILE))
+
+# Only the process holding this lease runs task runners and timers; the
+# other web workers are stateless HTTP front ends over the shared store.
+leader_lease = LeaderLease(SCHEDULER_LEASE_FILE)
+dispatch_wakeup = threading.Event()
+
+# In-memory thread pool for task runners, and their pause/cancel handles (by task id)
+running_threads = []
+task_controls = {}
+running_threads_lock = TimedLock("running_threads_lock")
 
-# Locks for thread safety on shared files
-file_lock = threading.Lock()
+# Append-only per-task logs, read only when requested
+task_logs = TaskLogStore()
 
-# In-memory thread pool for task runners
-running_threads = []
-running_threads_lock = threading.Lock()
+# Per-race results (WPM, accuracy, duration) in compact binary columns
+race_store = RaceStore()
+
+# Per-key hourly usage rollups, fed by runner events
+usage_rollup = UsageRollup()
+
+# Set while draining: no new tasks are admitted and runners checkpoint at the next race boundary
+draining = threading.Event()
+
+# Filled in by bootstrap() and the first request
+startup_metrics = {}
 
 # ==================== Helper Classes & Functions ====================
 
@@ -34,81 +103,239 @@ class TaskManager:
     purge old tasks, concurrency control, and logging.
     """
     
-    def __init__(self, tasks_file=TASKS_FILE):
+    def __init__(self, tasks_file=TASKS_FILE, archive: TaskArchive = None, snapshot_file=TASKS_SNAPSHOT_FILE):
         self.tasks_file = tasks_file
-        self.lock = file_lock  # Use shared lock for all file I/O
+        self.lock = file_lock  # writers only; see _read()
+        self.archive = archive or TaskArchive()
+        self.snapshot_file = snapshot_file
+        self._cache = (None, [])  # (store signature, parsed tasks) for readers
+
+    def _read(self):
+        # Safe without the lock since _write() swaps in whole files
+        if not os.path.exists(self.tasks_file):
+            return []
+        with open(self.tasks_file, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return []
+
+    def _write(self, tasks):
+        # Write-then-rename so readers in other processes never see a partial file
+        tmp = f"{self.tasks_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(tasks, f, indent=2)
+        os.replace(tmp, self.tasks_file)
+
+    def _cached_tasks(self):
+        """
+        Lock-free read for API and runner paths: the parsed store is reused
+        until its stat signature changes. Freed inodes are reused and
+        timestamps are only as fine as the filesystem clock, so two writes
+        close together can leave the same signature; a file modified within
+        STORE_CACHE_SLACK_NS of now is therefore re-read rather than cached.
+        The list is shared, so callers must copy any task they hand out.
+        """
+        signature = self.store_signature()
+        cached_signature, tasks = self._cache
+        if signature is None or signature != cached_signature:
+            tasks = self._read()
+            if signature is not None and time.time_ns() - signature[0] < STORE_CACHE_SLACK_NS:
+                signature = None  # too fresh to trust; the next read parses again
+            self._cache = (signature, tasks)
+        return tasks
 
     def load_tasks(self):
-        with self.lock:
-            if not os.path.exists(self.tasks_file):
-                return []
-            with open(self.tasks_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return []
+        return [dict(t) for t in self._cached_tasks()]
 
     def save_tasks(self, tasks):
         with self.lock:
-            with open(self.tasks_file, "w") as f:
-                json.dump(tasks, f, indent=2)
+            self._write(tasks)
+
+    def store_signature(self):
+        """Cheap change detector for the store, used by the dispatcher to notice other workers' writes."""
+        try:
+            st = os.stat(self.tasks_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+    def load_task_headers(self):
+        """
+        Startup view of the store: (id, status, key, start_at, races, total)
+        for every hot task, read from the binary snapshot when it is still
+        current, otherwise rebuilt from the JSON store and re-snapshotted.
+        """
+        headers = load_snapshot(self.snapshot_file, self.tasks_file)
+        if headers is None:
+            headers = [task_header(t) for t in self.load_tasks()]
+            self.write_snapshot(headers)
+        return [header_dict(h) for h in headers]
+
+    def write_snapshot(self, headers=None):
+        with self.lock:
+            if headers is None:
+                headers = [task_header(t) for t in self._read()]
+            save_snapshot(self.snapshot_file, self.tasks_file, headers)
+
+    # Read-modify-write operations hold the lock across load and save so
+    # concurrent writers (threads or worker processes) never lose updates.
 
     def add_task(self, task):
-        tasks = self.load_tasks()
-        tasks.append(task)
-        self.save_tasks(tasks)
+        with self.lock:
+            tasks = self._read()
+            tasks.append(task)
+            self._write(tasks)
 
     def update_task(self, task_id, **kwargs):
-        tasks = self.load_tasks()
-        updated = False
-        for task in tasks:
-            if task["id"] == task_id:
-                for k, v in kwargs.items():
-                    task[k] = v
-                updated = True
-                break
-        if updated:
-            self.save_tasks(tasks)
+        with self.lock:
+            tasks = self._read()
+            updated = False
+            for task in tasks:
+                if task["id"] == task_id:
+                    for k, v in kwargs.items():
+                        task[k] = v
+                    updated = True
+                    break
+            if updated:
+                self._write(tasks)
+        return updated
+
+    def update_tasks(self, updates):
+        """Apply {task_id: fields} to many tasks in one read-modify-write. Returns the ids updated."""
+        with self.lock:
+            tasks = self._read()
+            updated = []
+            for task in tasks:
+                fields = updates.get(task["id"])
+                if fields:
+                    task.update(fields)
+                    updated.append(task["id"])
+            if updated:
+                self._write(tasks)
         return updated
 
+    def transition(self, task_id, from_statuses, compute=None, **changes):
+        """
+        Atomically apply `changes` to a task if its status is one of
+        `from_statuses`. `compute(task)`, if given, returns further changes
+        worked out from the task as it is under the lock. Returns the task
+        as it was before, or None.
+        """
+        with self.lock:
+            tasks = self._read()
+            for task in tasks:
+                if task["id"] == task_id:
+                    if task["status"] not in from_statuses:
+                        return None
+                    before = dict(task)
+                    if compute:
+                        changes = {**changes, **compute(before)}
+                    task.update(changes)
+                    self._write(tasks)
+                    return before
+        return None
+
+    def requeue_running_tasks(self, task_ids=None):
+        """Put "running" tasks (all, or only `task_ids`) back to queued. Returns their ids."""
+        with self.lock:
+            tasks = self._read()
+            requeued = []
+            for t in tasks:
+                if t["status"] == TASK_STATUS_RUNNING and (task_ids is None or t["id"] in task_ids):
+                    t["status"] = TASK_STATUS_QUEUED
+                    requeued.append(t["id"])
+            if requeued:
+                self._write(tasks)
+        return requeued
+
     def get_task(self, task_id):
-        tasks = self.load_tasks()
-        for task in tasks:
+        for task in self._cached_tasks():
             if task["id"] == task_id:
-                return task
+                return dict(task)
         return None
 
+    @staticmethod
+    def key_usage(subscription_key, tasks):
+        """
+        Tasks counted against MAX_TASKS_PER_KEY: active tasks plus scheduled
+        ones. A recurring task whose run is active counts once, via the run.
+        """
+        mine = [t for t in tasks if t.get("subscription_key") == subscription_key]
+        active_parents = {t.get("parent_id") for t in mine if t["status"] in ACTIVE_STATUSES}
+        return sum(1 for t in mine if t["status"] in ACTIVE_STATUSES
+                   or (t["status"] == TASK_STATUS_SCHEDULED and t["id"] not in active_parents))
+
+    def count_key_usage(self, subscription_key):
+        return self.key_usage(subscription_key, self._cached_tasks())
+
+    def add_task_if_under_limit(self, task, limit):
+        """
+        Add `task` unless that would take its key's usage past `limit`;
+        counted and appended in one locked read-modify-write so concurrent
+        workers cannot overshoot. Returns True if added.
+        """
+        key = task.get("subscription_key")
+        with self.lock:
+            tasks = self._read()
+            before = self.key_usage(key, tasks)
+            after = self.key_usage(key, tasks + [task])
+            if after > before and after > limit:
+                return False
+            tasks.append(task)
+            self._write(tasks)
+        return True
+
     def find_tasks_by_key(self, subscription_key, active_only=True):
-        tasks = self.load_tasks()
+        tasks = self._cached_tasks()
         if active_only:
-            return [t for t in tasks if t.get("subscription_key") == subscription_key and t["status"] in [TASK_STATUS_QUEUED, TASK_STATUS_RUNNING]]
+            return [dict(t) for t in tasks if t.get("subscription_key") == subscription_key and t["status"] in ACTIVE_STATUSES]
         else:
-            return [t for t in tasks if t.get("subscription_key") == subscription_key]
+            return [dict(t) for t in tasks if t.get("subscription_key") == subscription_key]
+
+    def archive_finished_tasks(self, min_age_minutes=ARCHIVE_AFTER_MINUTES):
+        """
+        Move completed/failed tasks that finished at least `min_age_minutes`
+        ago out of the hot store into the day-partitioned archive.
+        """
+        cutoff = datetime.utcnow() - timedelta(minutes=min_age_minutes)
+        with self.lock:
+            tasks = self._read()
+            finished, hot = [], []
+            for t in tasks:
+                done_at = datetime.fromisoformat((t.get("finished_at") or t["created_at"]).replace("Z", ""))
+                if t["status"] in FINISHED_STATUSES and done_at <= cutoff:
+                    finished.append(t)
+                else:
+                    hot.append(t)
+            if finished:
+                # Fold the per-task log and race files into the archived records
+                for t in finished:
+                    t["logs"] = task_logs.read(t)
+                    t["race_summary"] = race_store.load(t["id"]).summary()
+                self.archive.append(finished)
+                self._write(hot)
+        for t in finished:
+            task_logs.remove(t["id"])
+            race_store.remove(t["id"])
+        return len(finished)
 
     def purge_old_tasks(self):
         """
-        Remove tasks that are completed or failed and older than TASK_PURGE_DAYS
+        Archive finished tasks, then drop archive partitions older than TASK_PURGE_DAYS
         """
-        tasks = self.load_tasks()
-        now = datetime.utcnow()
-        new_tasks = []
-        for t in tasks:
-            created = datetime.fromisoformat(t["created_at"].replace("Z", ""))
-            age_days = (now - created).days
-            if t["status"] in [TASK_STATUS_COMPLETED, TASK_STATUS_FAILED] and age_days >= TASK_PURGE_DAYS:
-                # Skip old completed/failed tasks
-                continue
-            new_tasks.append(t)
-        if len(new_tasks) != len(tasks):
-            self.save_tasks(new_tasks)
+        self.archive_finished_tasks()
+        cutoff_day = (datetime.utcnow() - timedelta(days=config.TASK_PURGE_DAYS)).date().isoformat()
+        self.archive.drop_before(cutoff_day)
 
     def total_stats(self):
         """
         Compute overall stats for homepage display
         """
         tasks = self.load_tasks()
-        total_races = sum(t.get("races_botted", 0) for t in tasks)
-        total_accounts = len(tasks)
+        archived = self.archive.summary()
+        total_races = sum(t.get("races_botted", 0) for t in tasks) + archived["races"]
+        total_accounts = len(tasks) + archived["tasks"]
         days_online = (datetime.utcnow() - datetime(2024, 12, 1)).days
         return {
             "total_races": total_races,
@@ -122,31 +349,39 @@ class TaskManager:
 
 class SubscriptionManager:
     """
-    Manages subscription keys and usage limits.
+    Manages subscription keys and usage limits. Keys are cached and only
+    re-read when the keys file changes, under a lock of their own so key
+    lookups never queue behind task-store writes.
     """
     def __init__(self, keys_file=KEYS_FILE):
         self.keys_file = keys_file
-        self.lock = file_lock
+        self.lock = TimedLock("keys_lock")
+        self._keys = frozenset()
+        self._signature = None
 
     def load_keys(self):
-        with self.lock:
-            if not os.path.exists(self.keys_file):
-                return []
-            with open(self.keys_file, "r") as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return []
+        try:
+            st = os.stat(self.keys_file)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            return frozenset()
+        if signature != self._signature:
+            with self.lock:
+                if signature != self._signature:
+                    with open(self.keys_file, "r") as f:
+                        try:
+                            self._keys = frozenset(json.load(f))
+                        except json.JSONDecodeError:
+                            self._keys = frozenset()
+                    self._signature = signature
+        return self._keys
 
     def is_valid_key(self, key):
         keys = self.load_keys()
         return key in keys
 
     def can_use_key(self, key, task_manager: TaskManager):
-        active_tasks = task_manager.find_tasks_by_key(key, active_only=True)
-        if len(active_tasks) >= MAX_TASKS_PER_KEY:
-            return False
-        return True
+        return task_manager.count_key_usage(key) < config.MAX_TASKS_PER_KEY
 
 
 def generate_task_id():
@@ -155,100 +390,482 @@ def generate_task_id():
 def iso_now():
     return datetime.utcnow().isoformat() + "Z"
 
+def parse_iso(value):
+    """
+    Parse an ISO timestamp (optionally "Z"-suffixed) into a UTC epoch float.
+    Naive timestamps are treated as UTC, matching iso_now().
+    """
+    dt = datetime.fromisoformat(value.strip().replace("Z", ""))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+def epoch_to_iso(ts):
+    return datetime.utcfromtimestamp(ts).isoformat() + "Z"
+
+def history_bound(value):
+    """
+    Validate a ?from=/?to= bound for the archive, which compares stored
+    timestamps as strings. A bare date is kept (as `to` it covers the whole
+    day); a date/time is normalised to naive UTC like the stored values.
+    Raises ValueError.
+    """
+    if not value or not value.strip():
+        return None
+    ts = parse_iso(value)
+    value = value.strip()
+    if len(value) == 10:
+        return value
+    return datetime.utcfromtimestamp(ts).isoformat()
+
 # ==================== Task Runner Logic ====================
 
+class TaskControl:
+    """
+    Interruptible wait handles for one runner thread: cancel wakes any wait
+    immediately, pause holds the runner at its next race boundary.
+    """
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.resumed = threading.Event()
+        self.resumed.set()
+
+    def cancel(self):
+        self.cancelled.set()
+        self.resumed.set()
+
+    def pause(self):
+        self.resumed.clear()
+
+    def resume(self):
+        self.resumed.set()
+
 def simulate_typing_task(task_id, task_manager: TaskManager):
     """
     Simulate the bot running typing races. This function runs in a background thread.
     """
     print(f"[TaskRunner] Starting task {task_id}")
+    with running_threads_lock:
+        control = task_controls.get(task_id) or TaskControl()
+    races_done = None  # tracked here; the store sees it via progress_writer, up to one flush window later
     while True:
         task = task_manager.get_task(task_id)
         if not task:
             print(f"[TaskRunner] Task {task_id} disappeared, exiting.")
             break
+        if races_done is None:
+            races_done = task.get("races_botted", 0)
 
         status = task["status"]
-        if status in [TASK_STATUS_COMPLETED, TASK_STATUS_FAILED]:
+        if status in FINISHED_STATUSES or control.cancelled.is_set():
             print(f"[TaskRunner] Task {task_id} finished with status {status}")
             break
 
-        if status == TASK_STATUS_QUEUED:
-            # Mark as running and add log
-            task_manager.update_task(task_id,
-                                     status=TASK_STATUS_RUNNING,
-                                     logs=task["logs"] + [{
-                                        "timestamp": iso_now(),
-                                        "message": "Task started running"
-                                     }])
-            continue
-
-        # If running, simulate typing races
-        try:
-            races_done = task.get("races_botted", 0)
-            total_races = task["how_many_races"]
-
-            if races_done < total_races:
-                # Simulate race time delay
-                time.sleep(4)  # 4 seconds per race for demo
+        if draining.is_set():
+            # Hand the task back to the queue with its progress written through;
+            # a paused task stays paused and is resumed by hand after the restart
+            if status == TASK_STATUS_PAUSED:
+                task_manager.update_task(task_id, races_botted=races_done)
+            else:
+                task_manager.update_task(task_id, status=TASK_STATUS_QUEUED, races_botted=races_done)
+            task_logs.append(task_id, "Task checkpointed for restart")
+            print(f"[TaskRunner] Task {task_id} checkpointed at {races_done} races")
+            break
 
-                # Update race count and logs
-                new_log = {
-                    "timestamp": iso_now(),
-                    "message": f"Completed race {races_done + 1}/{total_races}"
-                }
-                new_races_botted = races_done + 1
-                updated_logs = task["logs"] + [new_log]
+        if status == TASK_STATUS_PAUSED:
+            # Local resume wakes this at once; a resume written by another worker is seen on the next poll
+            control.pause()
+            control.resumed.wait(DISPATCH_POLL_SECONDS)
+            continue
 
-                task_manager.update_task(task_id, races_botted=new_races_botted, logs=updated_logs)
+        if status == TASK_STATUS_QUEUED:
+            # Mark as running and add log; re-queues after a drain, crash or
+            # pause run again but only the first start counts as a started task
+            if not task.get("started_at"):
+                usage_rollup.record(task.get("subscription_key"), "tasks_started")
+                task_manager.update_task(task_id, status=TASK_STATUS_RUNNING, started_at=iso_now())
             else:
-                # Completed all races
-                new_log = {
-                    "timestamp": iso_now(),
-                    "message": "Task completed successfully"
-                }
-                updated_logs = task["logs"] + [new_log]
-
-                task_manager.update_task(task_id, status=TASK_STATUS_COMPLETED, logs=updated_logs)
-                break
-        except Exception as e:
-            new_log = {
-                "timestamp": iso_now(),
-                "message": f"Error occurred: {str(e)}"
-            }
-            task_manager.update_task(task_id, status=TASK_STATUS_FAILED, logs=task["logs"] + [new_log])
-            break
+                task_manager.update_task(task_id, status=TASK_STATUS_RUNNING)
+            task_logs.append(task_id, "Task started running")
+            continue
 
-    # Remove from running threads list on exit
-    with running_threads_lock:
-        for t in running_threads:
-            if t.name == task_id:
-                running_threads.remove(t)
-                print(f"[TaskRunner] Removed thread for task {task_id}")
+        # If running, simulate typing races (profiled when an admin cProfile window targets this task)
+        with profile_scope(task_id):
+            try:
+                total_races = task["how_many_races"]
+
+                if races_done < total_races:
+                    # Simulate race time delay
+                    race_started = time.time()
+                    if clock.wait_for(control.cancelled, config.SIMULATED_RACE_SECONDS):
+                        break  # cancelled mid-race: not counted
+                    race_seconds = time.time() - race_started
+                    achieved_wpm = max(10, random.gauss(task["avg_wpm"], 5))
+                    achieved_acc = random.uniform(task["min_accuracy"], 100)
+                    race_store.append(task_id, time.time(), achieved_wpm, achieved_acc, race_seconds)
+                    usage_rollup.record(task.get("subscription_key"), "races")
+                    usage_rollup.record(task.get("subscription_key"), "busy_seconds", race_seconds)
+
+                    # Update race count and logs
+                    races_done += 1
+                    progress_writer.publish(task_id, races_botted=races_done)
+                    task_logs.append(task_id, f"Completed race {races_done}/{total_races}")
+                else:
+                    # Completed all races
+                    task_manager.update_task(task_id, status=TASK_STATUS_COMPLETED, finished_at=iso_now(), races_botted=races_done)
+                    task_logs.append(task_id, "Task completed successfully")
+                    usage_rollup.record(task.get("subscription_key"), "tasks_finished")
+                    break
+            except Exception as e:
+                task_manager.update_task(task_id, status=TASK_STATUS_FAILED, finished_at=iso_now())
+                task_logs.append(task_id, f"Error occurred: {str(e)}")
+                usage_rollup.record(task.get("subscription_key"), "failures")
                 break
+
     print(f"[TaskRunner] Exiting task {task_id}")
 
-def start_task_threads(task_manager: TaskManager):
+def run_task_thread(task_id, task_manager: TaskManager):
+    """
+    Thread target for a runner: always deregisters the thread, even if the
+    runner dies with an unexpected error, and wakes the dispatcher so the
+    freed slot goes to the next queued task.
+    """
+    try:
+        simulate_typing_task(task_id, task_manager)
+    finally:
+        with running_threads_lock:
+            task_controls.pop(task_id, None)
+            for t in running_threads:
+                if t.name == task_id:
+                    running_threads.remove(t)
+                    print(f"[TaskRunner] Removed thread for task {task_id}")
+                    break
+        dispatch_wakeup.set()
+
+def start_task_threads(task_manager: TaskManager, tasks=None):
     """
     Start new threads for queued tasks if under concurrency limit.
+    `tasks` may be pre-loaded task headers (see bootstrap()).
+    Only the scheduler-lease holder runs tasks; other workers just wake
+    their dispatcher.
     """
+    if draining.is_set():
+        return
+    if not leader_lease.is_held():
+        dispatch_wakeup.set()
+        return
     with running_threads_lock:
-        tasks = task_manager.get_all_tasks()
+        if tasks is None:
+            tasks = task_manager.get_all_tasks()
+        # Drop any runner that died without deregistering
+        running_threads[:] = [t for t in running_threads if t.is_alive()]
+        for task_id in set(task_controls) - {t.name for t in running_threads}:
+            task_controls.pop(task_id)
         running_count = len(running_threads)
 
         for task in tasks:
-            if task["status"] == TASK_STATUS_QUEUED and running_count < MAX_CONCURRENT_TASKS:
+            if task["status"] == TASK_STATUS_QUEUED and running_count < config.MAX_CONCURRENT_TASKS:
                 task_id = task["id"]
                 # Check if thread already running
                 if any(t.name == task_id for t in running_threads):
                     continue
 
-                thread = threading.Thread(target=simulate_typing_task, args=(task_id, task_manager), name=task_id, daemon=True)
+                task_controls[task_id] = TaskControl()
+                thread = threading.Thread(target=run_task_thread, args=(task_id, task_manager), name=task_id, daemon=True)
                 thread.start()
                 running_threads.append(thread)
                 running_count += 1
                 print(f"[TaskRunner] Spawned thread for task {task_id}")
 
+def sync_task_controls(tasks):
+    """
+    Apply pause/resume/cancel requests that other workers wrote to the store
+    to this process's runners, and re-queue "running" tasks that have no
+    runner here (only the lease holder runs tasks, so they are orphaned).
+    """
+    orphaned = []
+    with running_threads_lock:
+        for task in tasks:
+            control = task_controls.get(task["id"])
+            if control is None:
+                if task["status"] == TASK_STATUS_RUNNING:
+                    orphaned.append(task["id"])
+            elif task["status"] == TASK_STATUS_CANCELLED:
+                control.cancel()
+            elif task["status"] == TASK_STATUS_RUNNING:
+                control.resume()
+    if orphaned:
+        task_manager.requeue_running_tasks(orphaned)
+
+def pause_task(task_id):
+    before = task_manager.transition(task_id, [TASK_STATUS_QUEUED, TASK_STATUS_RUNNING],
+                                     lambda task: {"paused_from": task["status"]}, status=TASK_STATUS_PAUSED)
+    if before is None:
+        return None
+    with running_threads_lock:
+        control = task_controls.get(task_id)
+    if control:
+        control.pause()
+    task_logs.append(task_id, "Task paused")
+    return TASK_STATUS_PAUSED
+
+def resume_task(task_id):
+    with running_threads_lock:
+        control = task_controls.get(task_id)
+    runs_elsewhere = not leader_lease.is_held()
+
+    def resumed_status(task):
+        # A task paused mid-run goes straight back to its runner; otherwise it re-queues
+        if task.get("paused_from") == TASK_STATUS_RUNNING and (control or runs_elsewhere):
+            return TASK_STATUS_RUNNING
+        return TASK_STATUS_QUEUED
+
+    before = task_manager.transition(task_id, [TASK_STATUS_PAUSED],
+                                     lambda task: {"status": resumed_status(task)}, paused_from=None)
+    if before is None:
+        return None
+    status = resumed_status(before)
+    if control:
+        control.resume()
+    task_logs.append(task_id, "Task resumed")
+    if status == TASK_STATUS_QUEUED:
+        start_task_threads(task_manager)
+    else:
+        dispatch_wakeup.set()
+    return status
+
+def cancel_task(task_id):
+    before = task_manager.transition(task_id, ACTIVE_STATUSES + [TASK_STATUS_SCHEDULED],
+                                     status=TASK_STATUS_CANCELLED, finished_at=iso_now())
+    if before is None:
+        return None
+    task_scheduler.cancel(task_id)
+    with running_threads_lock:
+        control = task_controls.get(task_id)
+    if control:
+        control.cancel()  # the runner exits within milliseconds and frees its slot
+    task_logs.append(task_id, "Task cancelled")
+    dispatch_wakeup.set()
+    return TASK_STATUS_CANCELLED
+
+# ==================== Scheduled & Recurring Tasks ====================
+
+def fire_scheduled_task(task_id):
+    """
+    Called by the scheduler thread when a scheduled task becomes due.
+    One-off tasks are simply queued; recurring tasks spawn a fresh queued
+    run and push their next occurrence back onto the timer index.
+    """
+    task = task_manager.get_task(task_id)
+    if not task or task["status"] != TASK_STATUS_SCHEDULED:
+        return
+    due_ts = parse_iso(task["start_at"])
+    if due_ts > time.time() + 1:
+        # Stale timer (the occurrence already moved on); re-arm at the stored time
+        task_scheduler.schedule(due_ts, task_id)
+        return
+
+    repeat_every_hours = task.get("repeat_every_hours")
+    if not repeat_every_hours:
+        task_manager.update_task(task_id, status=TASK_STATUS_QUEUED)
+        task_logs.append(task_id, "Scheduled start reached, task queued")
+        start_task_threads(task_manager)
+        return
+
+    run = dict(task)
+    run.update({
+        "id": generate_task_id(),
+        "parent_id": task_id,
+        "created_at": iso_now(),
+        "status": TASK_STATUS_QUEUED,
+        "races_botted": 0
+    })
+    for field in ("start_at", "repeat_every_hours", "repeat_remaining", "started_at", "logs"):
+        run.pop(field, None)
+    if task_manager.add_task_if_under_limit(run, config.MAX_TASKS_PER_KEY):
+        task_logs.append(run["id"], f"Recurring run of task {task_id} queued")
+    else:
+        task_logs.append(task_id, "Run skipped: subscription key is at its active task limit")
+
+    remaining = task.get("repeat_remaining")
+    if remaining is not None:
+        remaining -= 1
+    if remaining is None or remaining > 0:
+        # This run is the single catch-up for any occurrences missed while
+        # offline; skip straight to the first future one (skips are not counted)
+        period = repeat_every_hours * 3600
+        missed = max(0, int((time.time() - due_ts) // period))
+        next_ts = due_ts + (missed + 1) * period
+        if missed:
+            task_logs.append(task_id, f"Skipped {missed} missed run(s)")
+        task_manager.update_task(task_id, start_at=epoch_to_iso(next_ts), repeat_remaining=remaining)
+        task_scheduler.schedule(next_ts, task_id)
+    else:
+        task_manager.update_task(task_id,
+                                 status=TASK_STATUS_COMPLETED,
+                                 finished_at=iso_now(),
+                                 repeat_remaining=0)
+        task_logs.append(task_id, "All recurring runs have been queued")
+    start_task_threads(task_manager)
+
+def schedule_pending_tasks(task_manager: TaskManager, tasks=None):
+    """
+    Rebuild the timer index from the task store, e.g. after a restart.
+    A missed occurrence fires immediately, as one catch-up run.
+    """
+    if tasks is None:
+        tasks = task_manager.get_all_tasks()
+    for task in tasks:
+        if task["status"] == TASK_STATUS_SCHEDULED and task.get("start_at") and task["id"] not in task_scheduler:
+            task_scheduler.schedule(parse_iso(task["start_at"]), task["id"])
+
+task_scheduler = TaskScheduler(fire_scheduled_task)
+
+# ==================== Runtime Config ====================
+
+def apply_config(changes):
+    """
+    React to live setting changes. A higher concurrency limit is filled from
+    the queue right away; a lower one lets surplus runners finish their task
+    rather than interrupting them. The other settings are read where used.
+    """
+    if "MAX_CONCURRENT_TASKS" in changes:
+        start_task_threads(task_manager)
+
+config.subscribe(apply_config)
+
+# ==================== Drain & Restart ====================
+
+def recover_interrupted_tasks(task_manager: TaskManager):
+    """
+    Tasks left "running" by a crash or hard kill have no runner any more;
+    put them back in the queue so they resume from their last persisted race.
+    """
+    recovered = task_manager.requeue_running_tasks()
+    for task_id in recovered:
+        task_logs.append(task_id, "Task recovered after restart")
+    if recovered:
+        print(f"[Startup] Re-queued {len(recovered)} interrupted task(s)")
+    return len(recovered)
+
+def drain(timeout=DRAIN_TIMEOUT_SECONDS):
+    """
+    Stop admitting new tasks, give in-flight races up to `timeout` seconds to
+    finish, and checkpoint everything still unfinished back to queued.
+    Returns a summary dict.
+    """
+    print(f"[Drain] Draining task runners (deadline {timeout}s)...")
+    draining.set()
+    task_scheduler.stop()
+    deadline = time.time() + timeout
+
+    with running_threads_lock:
+        threads = list(running_threads)
+        for control in task_controls.values():
+            control.resumed.set()  # wake paused runners so they checkpoint now
+    for t in threads:
+        t.join(max(0, deadline - time.time()))
+    still_running = [t.name for t in threads if t.is_alive()]
+
+    # Runners that missed the deadline are mid-race: cancel them so they exit
+    # without writing anything else (the unfinished race is redone after the
+    # restart), and only then re-queue their tasks and hand over the lease.
+    # Otherwise a late runner could write over the same task run elsewhere.
+    with running_threads_lock:
+        for task_id in still_running:
+            control = task_controls.get(task_id)
+            if control:
+                control.cancel()
+    grace = time.time() + DRAIN_CANCEL_GRACE_SECONDS
+    for t in threads:
+        t.join(max(0, grace - time.time()))
+    stuck = [t.name for t in threads if t.is_alive()]
+    if stuck:
+        print(f"[Drain] Runners did not stop after cancel: {stuck}")
+    progress_writer.flush()
+
+    requeued = len(task_manager.requeue_running_tasks(still_running)) if still_running else 0
+    if leader_lease.is_held():
+        usage_rollup.save()  # only the lease holder records usage
+    # Lets the next start skip parsing the store
+    task_manager.write_snapshot()
+    # Hand the scheduler role to another worker right away
+    leader_lease.release()
+
+    summary = {"drained": len(threads) - len(still_running), "timed_out": still_running, "requeued": requeued}
+    print(f"[Drain] Complete: {summary}")
+    return summary
+
+def bootstrap():
+    """
+    Fast startup path: work from the task-header snapshot, re-arm timers and
+    runners, and push archival/retention to a background thread so the
+    process is serving requests as early as possible.
+    """
+    headers = task_manager.load_task_headers()
+    if any(h["status"] == TASK_STATUS_RUNNING for h in headers):
+        # Resume anything a previous crash left mid-run
+        recover_interrupted_tasks(task_manager)
+        headers = task_manager.load_task_headers()
+    # Re-arm timers for scheduled and recurring tasks
+    schedule_pending_tasks(task_manager, headers)
+    # Kick off any queued task runners (if any)
+    start_task_threads(task_manager, headers)
+    threading.Thread(target=task_manager.purge_old_tasks, name="StartupPurge", daemon=True).start()
+    startup_metrics["bootstrap_ms"] = round((time.perf_counter() - PROCESS_START) * 1000, 1)
+    startup_metrics["hot_tasks"] = len(headers)
+    print(f"[Startup] Bootstrapped {len(headers)} hot task(s) in {startup_metrics['bootstrap_ms']} ms")
+
+def dispatch_loop():
+    """
+    Per-process background loop. Until this process holds the scheduler
+    lease it keeps trying to take it over (e.g. when the leader exits);
+    once leader, it picks up tasks other workers wrote to the shared store,
+    saves usage rollups every USAGE_SAVE_SECONDS and runs housekeeping
+    every HOUSEKEEPING_INTERVAL_SECONDS.
+    """
+    last_signature = None
+    last_housekeeping = 0
+    last_usage_save = 0
+    while not draining.is_set():
+        if not leader_lease.is_held():
+            if leader_lease.try_acquire():
+                print(f"[Dispatcher] Process {os.getpid()} acquired the scheduler lease")
+                bootstrap()  # includes a first purge
+                last_signature = task_manager.store_signature()
+                last_housekeeping = time.time()
+        else:
+            if time.time() - last_usage_save >= USAGE_SAVE_SECONDS:
+                last_usage_save = time.time()
+                try:
+                    usage_rollup.save()  # a no-op when nothing was recorded
+                except OSError as e:
+                    print(f"[Dispatcher] Saving usage rollups failed: {e}")
+            if time.time() - last_housekeeping >= HOUSEKEEPING_INTERVAL_SECONDS:
+                last_housekeeping = time.time()
+                try:
+                    task_manager.purge_old_tasks()
+                except Exception as e:
+                    print(f"[Dispatcher] Housekeeping failed: {e}")
+            signature = task_manager.store_signature()
+            if signature != last_signature:
+                last_signature = signature
+                tasks = task_manager.get_all_tasks()
+                sync_task_controls(tasks)
+                schedule_pending_tasks(task_manager, tasks)
+                start_task_threads(task_manager, tasks)
+        dispatch_wakeup.wait(DISPATCH_POLL_SECONDS)
+        dispatch_wakeup.clear()
+
+def start_background():
+    """Start this process's dispatcher; call once per process (dev server or WSGI worker)."""
+    threading.Thread(target=dispatch_loop, name="Dispatcher", daemon=True).start()
+    config.watch()
+
+def handle_sigterm(signum, frame):
+    drain()
+    sys.exit(0)
+
 # ==================== Validation & Utilities ====================
 
 def validate_task_form(form):
@@ -292,26 +909,72 @@ def validate_task_form(form):
     if not subscription_key:
         return False, "Subscription key is required"
 
+    start_at = form.get("start_at", "").strip()
+    if start_at:
+        try:
+            parse_iso(start_at)
+        except ValueError:
+            return False, "Invalid Start At value (expected ISO date/time)"
+
+    repeat_every_hours = form.get("repeat_every_hours", "").strip()
+    if repeat_every_hours:
+        try:
+            if float(repeat_every_hours) <= 0:
+                return False, "Repeat Every Hours must be positive"
+        except:
+            return False, "Invalid Repeat Every Hours value"
+
+    repeat_count = form.get("repeat_count", "").strip()
+    if repeat_count:
+        if not repeat_every_hours:
+            return False, "Repeat Count requires Repeat Every Hours"
+        try:
+            if int(repeat_count) <= 0:
+                return False, "Repeat Count must be a positive integer"
+        except:
+            return False, "Invalid Repeat Count value"
+
     return True, None
 
 # ==================== Flask Routes ====================
 
+@app.before_request
+def record_first_request():
+    if "first_request_ms" not in startup_metrics:
+        startup_metrics["first_request_ms"] = round((time.perf_counter() - PROCESS_START) * 1000, 1)
+        print(f"[Startup] Time to first request: {startup_metrics['first_request_ms']} ms")
+
+def require_admin(view):
+    """
+    Guard admin endpoints with the ADMIN_TOKEN env var (sent as X-Admin-Token).
+    Without a configured token the endpoints are disabled; behind a reverse
+    proxy every request looks local, so the address is no proof of anything.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return abort(403, "Admin endpoints are disabled; set ADMIN_TOKEN")
+        if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+            return abort(403, "Invalid admin token")
+        return view(*args, **kwargs)
+    return wrapper
+
 task_manager = TaskManager()
+progress_writer = ProgressWriter(task_manager.update_tasks, PROGRESS_FLUSH_SECONDS)
 subscription_manager = SubscriptionManager()
 
 @app.route("/")
 def home():
-    task_manager.purge_old_tasks()
     stats = task_manager.total_stats()
     return render_template("index.html", stats=stats)
 
 @app.route("/tasks")
 def tasks_page():
-    return render_template("tasks.html")
+    return cached_page(app, "tasks.html")
 
 @app.route("/modal_form")
 def modal_form_page():
-    return render_template("modal_form.html")
+    return cached_page(app, "modal_form.html")
 
 @app.route("/api/tasks", methods=["GET"])
 def api_get_tasks():
@@ -328,10 +991,90 @@ def api_task_logs(task_id):
     task = task_manager.get_task(task_id)
     if not task:
         return jsonify({"error": "Task not found"}), 404
-    return jsonify(task.get("logs", []))
+    return jsonify(task_logs.read(task))
+
+@app.route("/api/task/<task_id>/<action>", methods=["POST"])
+def api_task_control(task_id, action):
+    """
+    POST /api/task/<id>/pause, /resume or /cancel. The task's subscription
+    key must be sent (form or JSON field `subscription_key`) as proof of ownership.
+    """
+    handlers = {"pause": pause_task, "resume": resume_task, "cancel": cancel_task}
+    if action not in handlers:
+        return jsonify({"error": "Unknown action"}), 404
+    task = task_manager.get_task(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    body = request.get_json(silent=True) or request.form
+    key = str(body.get("subscription_key", ""))
+    if not key or not hmac.compare_digest(key, task.get("subscription_key") or ""):
+        return jsonify({"error": "subscription_key does not match this task"}), 403
+    status = handlers[action](task_id)
+    if status is None:
+        return jsonify({"error": f"Task cannot {action} from its current status"}), 409
+    return jsonify({"id": task_id, "status": status})
+
+@app.route("/api/task/<task_id>/races", methods=["GET"])
+def api_task_races(task_id):
+    """
+    Per-race stats for a task: summary, plus every race with ?raw=1.
+    """
+    task = task_manager.get_task(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    series = race_store.load(task_id)
+    result = {"summary": series.summary()}
+    if request.args.get("raw") == "1":
+        result["races"] = series.rows()
+    return jsonify(result)
+
+@app.route("/api/history", methods=["GET"])
+def api_history():
+    """
+    Stream archived tasks for ?key= as JSON lines, optionally limited to
+    ?from= / ?to= (ISO dates or timestamps, inclusive).
+    """
+    key = request.args.get("key", "").strip()
+    if not subscription_manager.is_valid_key(key):
+        return abort(403, "Invalid subscription key")
+    try:
+        start = history_bound(request.args.get("from"))
+        end = history_bound(request.args.get("to"))
+    except ValueError:
+        return abort(400, "from/to must be ISO date/time values")
+
+    def generate():
+        for t in task_manager.archive.iter_tasks(subscription_key=key, start=start, end=end):
+            t.pop("password", None)
+            yield json.dumps(t) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+@app.route("/api/usage", methods=["GET"])
+def api_usage():
+    """
+    Hourly usage rollups for ?key=, between ?from= and ?to= (ISO, default last 24h).
+    """
+    key = request.args.get("key", "").strip()
+    if not subscription_manager.is_valid_key(key):
+        return abort(403, "Invalid subscription key")
+    try:
+        end_ts = parse_iso(request.args["to"]) if request.args.get("to") else time.time()
+        start_ts = parse_iso(request.args["from"]) if request.args.get("from") else end_ts - 24 * 3600
+    except ValueError:
+        return abort(400, "from/to must be ISO date/time values")
+
+    usage = usage_rollup.query(key, start_ts, end_ts)
+    for bucket in usage["buckets"]:
+        bucket["hour"] = epoch_to_iso(bucket["hour"])
+    usage["key"] = key
+    return jsonify(usage)
 
 @app.route("/submit", methods=["POST"])
 def submit_task():
+    if draining.is_set():
+        return abort(503, "Server is draining, try again shortly")
+
     form = request.form
     is_valid, msg = validate_task_form(form)
     if not is_valid:
@@ -341,9 +1084,6 @@ def submit_task():
     if not subscription_manager.is_valid_key(subscription_key):
         return abort(403, "Invalid subscription key")
 
-    if not subscription_manager.can_use_key(subscription_key, task_manager):
-        return abort(403, f"Subscription key usage limit reached (max {MAX_TASKS_PER_KEY} active tasks)")
-
     # Create the new task dictionary
     new_task = {
         "id": generate_task_id(),
@@ -355,19 +1095,98 @@ def submit_task():
         "subscription_key": subscription_key,
         "created_at": iso_now(),
         "status": TASK_STATUS_QUEUED,
-        "races_botted": 0,
-        "logs": [{
-            "timestamp": iso_now(),
-            "message": "Task created and queued"
-        }]
+        "races_botted": 0
     }
+    log_message = "Task created and queued"
+
+    # Optional deferred start and recurrence
+    start_at = form.get("start_at", "").strip()
+    repeat_every_hours = form.get("repeat_every_hours", "").strip()
+    repeat_count = form.get("repeat_count", "").strip()
+    due_ts = parse_iso(start_at) if start_at else time.time()
+    if repeat_every_hours or due_ts > time.time():
+        new_task["status"] = TASK_STATUS_SCHEDULED
+        new_task["start_at"] = epoch_to_iso(due_ts)
+        log_message = f"Task scheduled for {new_task['start_at']}"
+        if repeat_every_hours:
+            new_task["repeat_every_hours"] = float(repeat_every_hours)
+            new_task["repeat_remaining"] = int(repeat_count) if repeat_count else None
+
+    # Counted and added under the store lock, so concurrent workers cannot overshoot the limit
+    if not task_manager.add_task_if_under_limit(new_task, config.MAX_TASKS_PER_KEY):
+        return abort(403, f"Subscription key usage limit reached (max {config.MAX_TASKS_PER_KEY} active tasks)")
+    task_logs.append(new_task["id"], log_message)
+
+    if new_task["status"] == TASK_STATUS_SCHEDULED:
+        if leader_lease.is_held():
+            task_scheduler.schedule(due_ts, new_task["id"])
+        else:
+            dispatch_wakeup.set()
+    else:
+        # Start threads for queued tasks (respecting concurrency)
+        start_task_threads(task_manager)
 
-    task_manager.add_task(new_task)
+    return redirect(url_for("tasks_page"))
 
-    # Start threads for queued tasks (respecting concurrency)
-    start_task_threads(task_manager)
+@app.route("/admin/drain", methods=["POST"])
+@require_admin
+def admin_drain():
+    """
+    Drain runners and exit the process once the response is sent; a drained
+    process has handed off its scheduler lease and admits no new tasks.
+    """
+    timeout = request.args.get("timeout", DRAIN_TIMEOUT_SECONDS, type=float)
+    summary = drain(timeout)
+    threading.Timer(0.5, os._exit, args=(0,)).start()
+    return jsonify(summary)
+
+@app.route("/admin/profile", methods=["GET"])
+@require_admin
+def admin_profile():
+    """
+    Profile the process (or one task runner via ?task_id=) for ?seconds=.
+    mode=sample returns collapsed stacks for flame graphs; mode=cprofile
+    returns a cumulative-time report of the runner iterations.
+    """
+    seconds = request.args.get("seconds", 5, type=float)
+    task_id = request.args.get("task_id") or None
+    mode = request.args.get("mode", "sample")
+    if mode == "sample":
+        interval = request.args.get("interval_ms", 5, type=float) / 1000
+        body = format_collapsed(sample_stacks(seconds, interval=interval, thread_name=task_id))
+    elif mode == "cprofile":
+        body = run_cprofile(seconds, target=task_id)
+    else:
+        return abort(400, "mode must be 'sample' or 'cprofile'")
+    return app.response_class(body, mimetype="text/plain")
+
+@app.route("/admin/locks", methods=["GET"])
+@require_admin
+def admin_locks():
+    return jsonify(lock_stats())
+
+@app.route("/admin/config", methods=["GET", "POST"])
+@require_admin
+def admin_config():
+    """
+    GET: current settings. POST (JSON or form, e.g. MAX_CONCURRENT_TASKS=5):
+    validate, apply live and persist to .env so every worker picks it up.
+    """
+    if request.method == "POST":
+        changes = request.get_json(silent=True) or request.form.to_dict()
+        if not changes:
+            return jsonify({"error": "No settings given"}), 400
+        try:
+            applied = config.update(changes)
+        except ConfigError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify({"applied": applied, "config": config.as_dict()})
+    return jsonify(config.as_dict())
 
-    return redirect(url_for("tasks_page"))
+@app.route("/admin/startup", methods=["GET"])
+@require_admin
+def admin_startup():
+    return jsonify(startup_metrics)
 
 @app.errorhandler(404)
 def page_not_found(e):
@@ -381,10 +1200,11 @@ def internal_error(e):
 
 if __name__ == "__main__":
     print("Starting Nitrotype Bot Manager Flask backend...")
-    # Purge old tasks on startup
-    task_manager.purge_old_tasks()
-    # Kick off any queued task runners (if any)
-    start_task_threads(task_manager)
-
-    # Run Flask with debug for dev, bind all interfaces
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    start_background()
+
+    # Run Flask with debug for dev, bind all interfaces. The reloader stays
+    # off: it serves from a child process and installs its own SIGTERM
+    # handler there, so runners would die mid-race instead of draining.
+    # For production use `gunicorn -c gunicorn.conf.py wsgi:app`.
+    app.run(host="0.0.0.0", port=5000, debug=True, use_reloader=False)
@@ -0,0 +1,112 @@
+"""
+Lock contention benchmark for the task-runner hot path in app.py.
+
+Each simulated runner repeats the per-race bookkeeping of a real runner
+(log append, race record append, key lookup, task read, progress update)
+against its own task, with a short simulated network wait (--io-ms) in
+place of the race itself. Throughput and total lock wait are reported per
+runner count. --baseline reproduces the old lock layout for comparison:
+one lock per store, and key lookups and task reads under the global
+file_lock. Progress goes through the coalescing writer in both modes, so
+the comparison isolates the locking alone.
+
+    python bench_locks.py
+    python bench_locks.py --baseline --runners 1,4,16
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_TASKS = 50
+
+
+def total_wait_ms(stats):
+    return sum(s["total_wait_ms"] for s in stats.values())
+
+
+def run_round(app, runners, duration, baseline, io_seconds):
+    global_lock = app.file_lock if baseline else contextlib.nullcontext()
+    tasks = app.task_manager.get_all_tasks()
+    counts = [0] * runners
+    start = threading.Barrier(runners + 1)
+    stop = threading.Event()
+
+    def runner(n):
+        task = tasks[n % len(tasks)]
+        task_id, key = task["id"], task["subscription_key"]
+        start.wait()
+        i = 0
+        while not stop.is_set():
+            app.task_logs.append(task_id, f"Completed race {i}")
+            app.race_store.append(task_id, time.time(), 80.0, 97.0, 4.0)
+            with global_lock:
+                app.subscription_manager.is_valid_key(key)
+            with global_lock:
+                app.task_manager.get_task(task_id)
+            app.progress_writer.publish(task_id, races_botted=i)
+            time.sleep(io_seconds)
+            i += 1
+        counts[n] = i
+
+    threads = [threading.Thread(target=runner, args=(n,)) for n in range(runners)]
+    for t in threads:
+        t.start()
+    before = total_wait_ms(app.lock_stats())
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+    return sum(counts) / elapsed, total_wait_ms(app.lock_stats()) - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runners", default="1,2,4,8,16", help="comma-separated runner counts (default 1,2,4,8,16)")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per round (default 2)")
+    parser.add_argument("--io-ms", type=float, default=2.0, help="simulated network wait per race, ms (default 2)")
+    parser.add_argument("--baseline", action="store_true", help="emulate the single-lock layout")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autotyper-bench-")
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_DIR)
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import app
+        from utils.race_stats import RaceStore
+        from utils.task_logs import TaskLogStore
+        if args.baseline:
+            app.task_logs = TaskLogStore(stripes=1)
+            app.race_store = RaceStore(stripes=1)
+        keys = [f"BENCHKEY{i}" for i in range(8)]
+        with open(app.KEYS_FILE, "w") as f:
+            json.dump(keys, f)
+        app.task_manager.save_tasks([
+            {"id": app.generate_task_id(), "subscription_key": keys[i % len(keys)], "status": app.TASK_STATUS_RUNNING,
+             "created_at": app.iso_now(), "races_botted": 0, "how_many_races": 10**6}
+            for i in range(SEED_TASKS)
+        ])
+
+    print(f"{'baseline' if args.baseline else 'striped'} locking, {args.duration:g}s per round")
+    print(f"{'runners':>8}{'ops/s':>12}{'per runner':>12}{'lock wait ms':>14}")
+    try:
+        for runners in (int(n) for n in args.runners.split(",")):
+            rate, waited = run_round(app, runners, args.duration, args.baseline, args.io_ms / 1000)
+            print(f"{runners:>8}{rate:>12.0f}{rate / runners:>12.0f}{waited:>14.1f}")
+    finally:
+        app.progress_writer.stop()
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 import os
+import json
+import signal
+import sys
 import time
 import threading
 import queue
 import random
 import logging
-import requests
+from collections import namedtuple
+from types import MappingProxyType
 from typing import Optional, Dict
 
+from utils import clock
+from utils.config import RuntimeConfig
+from utils.profiler import TimedLock, profile_scope
+from utils.race_stats import RaceSeries
+from utils.scheduler import TaskScheduler
+
 # ---- SETUP LOGGING ----
 logging.basicConfig(
     level=logging.DEBUG,  # Set to DEBUG for maximum verbosity
@@ -15,11 +25,15 @@ logging.basicConfig(
 )
 
 # ---- CONSTANTS AND CONFIG ----
-MAX_CONCURRENT_TASKS = 3
+# MAX_CONCURRENT_TASKS, RETRY_LIMIT, RACE_MIN_SECONDS, RACE_MAX_SECONDS: env/.env,
+# validated, and reloaded live when .env changes (see utils/config.py)
+config = RuntimeConfig()
 PROXIES_FILE = "proxies.txt"
 CAPTCHA_API_KEY = os.getenv("CAPTCHA_API_KEY")  # Put your CAPTCHA solving service key here
 SUBSCRIPTION_KEYS = {"SUBSCRIPTION_KEY_123", "SUBSCRIPTION_KEY_456"}  # Demo keys, replace as needed
-RETRY_LIMIT = 5
+DRAIN_TIMEOUT_SECONDS = 30
+DRAIN_CANCEL_GRACE_SECONDS = 5  # how long cancelled runners get to unwind before drain gives up on them
+CHECKPOINT_FILE = "bot_checkpoint.json"
 MIN_WPM = 10
 MAX_WPM = 180
 MIN_ACC = 85
@@ -32,18 +46,27 @@ class NitrotypeAPI:
     Simulates Nitrotype.js API integration.
     Replace placeholders with real Nitrotype.js calls.
     """
-    def __init__(self, username: str, password: str, proxy: Optional[str] = None):
+    def __init__(self, username: str, password: str, proxy: Optional[str] = None,
+                 interrupt: Optional[threading.Event] = None):
         self.username = username
         self.password = password
         self.proxy = proxy
+        self.interrupt = interrupt or threading.Event()  # set to abort any in-progress wait
         self.logged_in = False
         self.races_completed = 0
+        self.last_result: Optional[tuple] = None  # (wpm, accuracy, duration) of the last completed race
+
+    def _wait(self, seconds: float) -> bool:
+        """Sleep for `seconds` unless interrupted; returns True if interrupted."""
+        return clock.wait_for(self.interrupt, seconds)
 
     def login(self) -> bool:
         logging.debug(f"[{self.username}] Attempting to login...")
         try:
             # Placeholder: Replace with actual Nitrotype.js login call
-            time.sleep(random.uniform(1.0, 1.5))  # Simulate network latency
+            if self._wait(random.uniform(1.0, 1.5)):  # Simulate network latency
+                logging.info(f"[{self.username}] Login interrupted.")
+                return False
             if not self.username or not self.password:
                 raise ValueError("Username or password missing")
             # Simulate successful login
@@ -61,7 +84,9 @@ class NitrotypeAPI:
         try:
             logging.debug(f"[{self.username}] Solving CAPTCHA with API key...")
             # Placeholder for actual CAPTCHA solving API call
-            time.sleep(2)  # Simulate delay
+            if self._wait(2):  # Simulate delay
+                logging.info(f"[{self.username}] CAPTCHA solving interrupted.")
+                return False
             # Pretend captcha was solved successfully
             logging.info(f"[{self.username}] CAPTCHA solved successfully.")
             return True
@@ -76,14 +101,17 @@ class NitrotypeAPI:
         logging.debug(f"[{self.username}] Starting a race at target WPM {avg_wpm} and min accuracy {min_acc}%.")
         try:
             # Placeholder: Simulate the race with delays and accuracy checks
-            race_duration = random.uniform(5, 10)  # seconds per race
-            time.sleep(race_duration)
+            race_duration = random.uniform(config.RACE_MIN_SECONDS, config.RACE_MAX_SECONDS)
+            if self._wait(race_duration):
+                logging.info(f"[{self.username}] Race interrupted, not counted.")
+                return False
             achieved_wpm = random.uniform(max(MIN_WPM, avg_wpm - 10), min(MAX_WPM, avg_wpm + 10))
             achieved_acc = random.uniform(min_acc, 100)
             if achieved_acc < min_acc:
                 logging.warning(f"[{self.username}] Race failed due to low accuracy: {achieved_acc:.2f}% < {min_acc}%")
                 return False
             self.races_completed += 1
+            self.last_result = (achieved_wpm, achieved_acc, race_duration)
             logging.info(f"[{self.username}] Race completed: WPM={achieved_wpm:.2f}, Accuracy={achieved_acc:.2f}%. Total races: {self.races_completed}")
             return True
         except Exception as e:
@@ -108,23 +136,89 @@ class BotTask:
         self.num_races = num_races
         self.subscription_key = subscription_key
         self.races_done = 0
-        self.active = False
+        self.active = False  # cleared to stop gracefully at the next race boundary
+        self.cancel_event = threading.Event()  # set to stop immediately, interrupting waits
+        self.resume_event = threading.Event()  # cleared while paused
+        self.resume_event.set()
         self.failed_attempts = 0
         self.proxy = None  # Will assign from proxy pool later
+        self.races = RaceSeries()  # per-race results of this run
+        self.start_at: Optional[float] = None  # epoch seconds; None = start now
+        self.repeat_every: Optional[float] = None  # seconds between recurring runs
+        self.repeat_count: Optional[int] = None  # remaining runs; None = forever
+
+    @property
+    def paused(self) -> bool:
+        return not self.resume_event.is_set()
+
+    def wait(self, seconds: float) -> bool:
+        """Interruptible sleep; returns True if the task was cancelled meanwhile."""
+        return clock.wait_for(self.cancel_event, seconds)
+
+    def wait_while_paused(self):
+        """Block while paused; returns immediately on resume or cancel."""
+        while not self.resume_event.wait(1.0):
+            if self.cancel_event.is_set():
+                return
+
+    def to_checkpoint(self) -> Dict:
+        return {
+            "username": self.username,
+            "password": self.password,
+            "avg_wpm": self.avg_wpm,
+            "min_acc": self.min_acc,
+            "num_races": self.num_races,
+            "subscription_key": self.subscription_key,
+            "races_done": self.races_done,
+            "start_at": self.start_at,
+            "repeat_every": self.repeat_every,
+            "repeat_count": self.repeat_count,
+        }
+
+    @classmethod
+    def from_checkpoint(cls, data: Dict) -> "BotTask":
+        task = cls(data["username"], data["password"], data["avg_wpm"], data["min_acc"],
+                   data["num_races"], data["subscription_key"])
+        task.races_done = data.get("races_done", 0)
+        task.start_at = data.get("start_at")
+        task.repeat_every = data.get("repeat_every")
+        task.repeat_count = data.get("repeat_count")
+        return task
+
+    def next_run(self) -> "BotTask":
+        """Fresh copy of this task for the next recurring run."""
+        return BotTask(self.username, self.password, self.avg_wpm, self.min_acc, self.num_races, self.subscription_key)
 
 
 # ---- BOT MANAGER ----
+# Point-in-time view of the manager for monitoring. A new one is built under
+# the manager lock on every state change and swapped in with a single
+# attribute assignment, so readers never take the lock. Its mappings are
+# read-only views, so no reader can change what the others see.
+ManagerSnapshot = namedtuple("ManagerSnapshot", ["stats", "active_tasks"])
+
+
 class AutoTyperBotManager:
     def __init__(self):
         self.task_queue = queue.Queue()
         self.active_tasks: Dict[str, BotTask] = {}
-        self.lock = threading.Lock()
+        self.scheduled_tasks: Dict[str, BotTask] = {}
+        self.scheduler = TaskScheduler(self._on_task_due, name="BotTaskScheduler")
+        # Lock per concern: dispatch state (queue, active/scheduled maps), proxy
+        # rotation and counters. Order: lock, then proxy_lock or counter_lock.
+        self.lock = TimedLock("bot_manager")
+        self.idle = threading.Condition(self.lock)  # notified whenever an active task finishes
+        self.proxy_lock = TimedLock("bot_proxies")
+        self.counter_lock = TimedLock("bot_counters")
         self.proxies = self.load_proxies(PROXIES_FILE)
         self.running = True
+        self.accepting = True
 
         self.total_races_botted = 0
         self.total_accounts_botted = 0
         self.start_time = time.time()
+        self._publish_snapshot()
+        config.subscribe(self._on_config_change)
 
         logging.info("AutoTyperBotManager initialized.")
 
@@ -151,41 +245,126 @@ class AutoTyperBotManager:
         if not self.proxies:
             return None
         # Rotate proxies by popping first and appending to the end (round-robin)
-        proxy = self.proxies.pop(0)
-        self.proxies.append(proxy)
+        with self.proxy_lock:
+            proxy = self.proxies.pop(0)
+            self.proxies.append(proxy)
         logging.debug(f"Assigned proxy {proxy}")
         return proxy
 
-    def add_task(self, task: BotTask) -> bool:
+    def add_task(self, task: BotTask, start_at: Optional[float] = None,
+                 repeat_every: Optional[float] = None, repeat_count: Optional[int] = None) -> bool:
+        """
+        Run `task` now, or at epoch time `start_at`. With `repeat_every`
+        (seconds) the task recurs, `repeat_count` times or indefinitely.
+        """
         if not self.validate_subscription(task.subscription_key):
             logging.error(f"[{task.username}] Subscription key invalid.")
             return False
+        if start_at is not None:
+            task.start_at = start_at
+        if repeat_every is not None:
+            task.repeat_every = repeat_every
+            task.repeat_count = repeat_count
+
+        if task.repeat_every or (task.start_at and task.start_at > time.time()):
+            with self.lock:
+                if not self.accepting:
+                    logging.warning(f"[{task.username}] Manager is draining, task rejected.")
+                    return False
+                if task.username in self.scheduled_tasks:
+                    logging.warning(f"[{task.username}] Task already scheduled.")
+                    return False
+                self.scheduled_tasks[task.username] = task
+                self._publish_snapshot()
+            due = task.start_at or time.time()
+            self.scheduler.schedule(due, task.username)
+            logging.info(f"[{task.username}] Task scheduled for {time.ctime(due)}.")
+            return True
+        return self._admit(task)
+
+    def _on_task_due(self, username: str):
+        with self.lock:
+            template = self.scheduled_tasks.get(username)
+            if template is None:
+                return
+            if not template.repeat_every:
+                self.scheduled_tasks.pop(username, None)
+                run = template
+            else:
+                run = template.next_run()
+                if template.repeat_count is not None:
+                    template.repeat_count -= 1
+                if template.repeat_count is None or template.repeat_count > 0:
+                    # One catch-up run for missed occurrences, then the first future one
+                    now = time.time()
+                    due = template.start_at or now
+                    missed = max(0, int((now - due) // template.repeat_every))
+                    template.start_at = due + (missed + 1) * template.repeat_every
+                    self.scheduler.schedule(template.start_at, username)
+                else:
+                    self.scheduled_tasks.pop(username, None)
+            self._publish_snapshot()
+        logging.info(f"[{username}] Scheduled task is due.")
+        if not self._admit(run):
+            logging.warning(f"[{username}] Skipping this occurrence, previous run still active.")
+
+    def unschedule_task(self, username: str) -> bool:
         with self.lock:
+            removed = self.scheduled_tasks.pop(username, None) is not None
+            self._publish_snapshot()
+        self.scheduler.cancel(username)
+        return removed
+
+    def _admit(self, task: BotTask) -> bool:
+        with self.lock:
+            if not self.accepting:
+                logging.warning(f"[{task.username}] Manager is draining, task rejected.")
+                return False
             if task.username in self.active_tasks or any(t.username == task.username for t in list(self.task_queue.queue)):
                 logging.warning(f"[{task.username}] Task already running or queued.")
                 return False
 
-            if len(self.active_tasks) < MAX_CONCURRENT_TASKS:
+            if len(self.active_tasks) < config.MAX_CONCURRENT_TASKS:
                 logging.info(f"[{task.username}] Starting task immediately.")
-                task.proxy = self.assign_proxy()
-                self.active_tasks[task.username] = task
-                threading.Thread(target=self._run_task, args=(task,), daemon=True).start()
+                self._start(task)
             else:
                 logging.info(f"[{task.username}] Task queued (max concurrency reached).")
                 self.task_queue.put(task)
+            self._publish_snapshot()
         return True
 
+    def _start(self, task: BotTask):
+        """Give `task` a slot and a runner thread. Call with self.lock held."""
+        task.proxy = self.assign_proxy()
+        task.active = True  # set here, not in the runner, so a drain can clear it before the thread starts
+        self.active_tasks[task.username] = task
+        threading.Thread(target=self._run_task, args=(task,), daemon=True).start()
+
     def _run_task(self, task: BotTask):
-        task.active = True
-        api = NitrotypeAPI(task.username, task.password, proxy=task.proxy)
+        """Runner thread: the task's slot is always released, even if the run dies with an error."""
+        botted = False
+        try:
+            botted = self._run_races(task)
+        except Exception as e:
+            logging.error(f"[{task.username}] Task crashed: {e}")
+            botted = task.races_done > 0
+        finally:
+            self._finish_task(task, botted=botted)
+
+    def _run_races(self, task: BotTask) -> bool:
+        """Log in and race until done or stopped; returns False if login failed."""
+        api = NitrotypeAPI(task.username, task.password, proxy=task.proxy, interrupt=task.cancel_event)
 
         if not api.login():
             logging.error(f"[{task.username}] Login failed, task aborted.")
-            self._finish_task(task)
-            return
+            return False
 
-        for i in range(task.num_races):
-            if not task.active:
+        attempt = 1  # tries spent on the current race
+        for i in range(task.races_done, task.num_races):
+            if task.paused:
+                logging.info(f"[{task.username}] Task paused.")
+                task.wait_while_paused()
+            if task.cancel_event.is_set() or not task.active:
                 logging.info(f"[{task.username}] Task stopped externally.")
                 break
 
@@ -193,90 +372,240 @@ class AutoTyperBotManager:
             if not api.solve_captcha():
                 logging.error(f"[{task.username}] CAPTCHA solving failed, retrying...")
                 task.failed_attempts += 1
-                if task.failed_attempts > RETRY_LIMIT:
+                if task.failed_attempts > config.RETRY_LIMIT:
                     logging.error(f"[{task.username}] Retry limit exceeded, aborting task.")
                     break
-                time.sleep(5)
+                attempt += 1
+                if task.wait(5):
+                    break
                 continue
 
-            success = api.start_race(task.avg_wpm, task.min_acc)
+            with profile_scope(task.username):
+                success = api.start_race(task.avg_wpm, task.min_acc)
+            if task.cancel_event.is_set():
+                break
             if not success:
                 task.failed_attempts += 1
                 logging.warning(f"[{task.username}] Race attempt failed (attempt {task.failed_attempts}). Retrying...")
-                if task.failed_attempts > RETRY_LIMIT:
+                if task.failed_attempts > config.RETRY_LIMIT:
                     logging.error(f"[{task.username}] Retry limit exceeded during races, aborting.")
                     break
-                time.sleep(3)
+                attempt += 1
+                if task.wait(3):
+                    break
                 continue
 
+            wpm, acc, duration = api.last_result
+            task.races.append(time.time(), wpm, acc, duration, attempt)
+            attempt = 1
             task.races_done += 1
-            with self.lock:
+            with self.counter_lock:
                 self.total_races_botted += 1
+            with self.lock:
+                self._publish_snapshot()  # races_done changed too
 
             logging.info(f"[{task.username}] Completed race {task.races_done}/{task.num_races}.")
 
         api.logout()
-        self._finish_task(task)
+        return True
 
-    def _finish_task(self, task: BotTask):
-        logging.info(f"[{task.username}] Task finished. Total races completed: {task.races_done}.")
+    def _finish_task(self, task: BotTask, botted: bool = True):
+        """
+        Release the task's slot and start the next queued task; `botted` is
+        False when the account never got past login. Idempotent, because a
+        cancel releases the slot before the runner thread has unwound.
+        """
         with self.lock:
-            self.active_tasks.pop(task.username, None)
-            self.total_accounts_botted += 1
-            if not self.task_queue.empty():
-                next_task: BotTask = self.task_queue.get()
-                logging.info(f"[{next_task.username}] Dequeued task, starting now.")
-                next_task.proxy = self.assign_proxy()
-                self.active_tasks[next_task.username] = next_task
-                threading.Thread(target=self._run_task, args=(next_task,), daemon=True).start()
-
-    def stop_task(self, username: str):
+            if self.active_tasks.get(task.username) is not task:
+                return
+            logging.info(f"[{task.username}] Task finished. Total races completed: {task.races_done}.")
+            self.active_tasks.pop(task.username)
+            if botted:
+                with self.counter_lock:
+                    self.total_accounts_botted += 1
+            self.idle.notify_all()
+            self._fill_slots()
+
+    def _fill_slots(self):
+        """Start queued tasks while there are free slots. Call with self.lock held."""
+        while self.accepting and not self.task_queue.empty() and len(self.active_tasks) < config.MAX_CONCURRENT_TASKS:
+            next_task: BotTask = self.task_queue.get()
+            logging.info(f"[{next_task.username}] Dequeued task, starting now.")
+            self._start(next_task)
+        self._publish_snapshot()
+
+    def _on_config_change(self, changes: Dict):
+        # A raised limit takes effect at once; a lowered one as active tasks finish
+        if "MAX_CONCURRENT_TASKS" in changes:
+            with self.lock:
+                self._fill_slots()
+
+    def stop_task(self, username: str) -> bool:
+        """Alias of cancel_task, kept for existing callers."""
+        return self.cancel_task(username)
+
+    def cancel_task(self, username: str) -> bool:
+        """
+        Cancel an active, queued or scheduled task. An active task's waits are
+        interrupted and its slot goes to the next queued task right away.
+        """
+        if self.unschedule_task(username):
+            logging.info(f"[{username}] Removed scheduled task.")
         with self.lock:
             task = self.active_tasks.get(username)
-            if task:
-                task.active = False
-                logging.info(f"[{username}] Stop requested for active task.")
-            else:
-                # Also remove from queue if waiting
-                removed = False
-                temp_queue = queue.Queue()
-                while not self.task_queue.empty():
-                    t = self.task_queue.get()
-                    if t.username == username:
-                        logging.info(f"[{username}] Removed task from queue.")
-                        removed = True
-                        continue
-                    temp_queue.put(t)
-                self.task_queue = temp_queue
-                if not removed:
-                    logging.warning(f"[{username}] No active or queued task found to stop.")
-
-    def get_stats(self) -> Dict[str, int]:
-        uptime = int(time.time() - self.start_time)
-        return {
-            "total_races_botted": self.total_races_botted,
-            "total_accounts_botted": self.total_accounts_botted,
-            "active_tasks": len(self.active_tasks),
-            "queued_tasks": self.task_queue.qsize(),
-            "uptime_seconds": uptime
-        }
+        if task:
+            task.cancel_event.set()
+            task.resume_event.set()  # wake it if paused so the thread can exit
+            logging.info(f"[{username}] Cancelled active task.")
+            self._finish_task(task, botted=task.races_done > 0)
+            return True
+        with self.lock:
+            # Otherwise remove it from the queue if waiting
+            removed = False
+            temp_queue = queue.Queue()
+            while not self.task_queue.empty():
+                t = self.task_queue.get()
+                if t.username == username:
+                    logging.info(f"[{username}] Removed task from queue.")
+                    removed = True
+                    continue
+                temp_queue.put(t)
+            self.task_queue = temp_queue
+            self._publish_snapshot()
+            if not removed:
+                logging.warning(f"[{username}] No active or queued task found to stop.")
+            return removed
+
+    def pause_task(self, username: str) -> bool:
+        """Pause an active task at its next race boundary; it keeps its slot."""
+        with self.lock:
+            task = self.active_tasks.get(username)
+        if not task:
+            return False
+        task.resume_event.clear()
+        with self.lock:
+            self._publish_snapshot()
+        logging.info(f"[{username}] Pause requested.")
+        return True
 
-    def get_active_tasks(self) -> Dict[str, Dict]:
+    def resume_task(self, username: str) -> bool:
+        with self.lock:
+            task = self.active_tasks.get(username)
+        if not task or not task.paused:
+            return False
+        task.resume_event.set()
         with self.lock:
-            return {
-                username: {
+            self._publish_snapshot()
+        logging.info(f"[{username}] Resumed.")
+        return True
+
+    def _publish_snapshot(self):
+        """Rebuild and swap in the monitoring snapshot. Call with self.lock held."""
+        with self.counter_lock:
+            counters = (self.total_races_botted, self.total_accounts_botted)
+        self._snapshot = ManagerSnapshot(
+            stats=MappingProxyType({
+                "total_races_botted": counters[0],
+                "total_accounts_botted": counters[1],
+                "active_tasks": len(self.active_tasks),
+                "queued_tasks": self.task_queue.qsize(),
+                "scheduled_tasks": len(self.scheduled_tasks),
+            }),
+            active_tasks=MappingProxyType({
+                username: MappingProxyType({
                     "races_done": task.races_done,
                     "num_races": task.num_races,
                     "avg_wpm": task.avg_wpm,
                     "min_acc": task.min_acc,
                     "proxy": task.proxy,
-                }
+                    "paused": task.paused,
+                })
                 for username, task in self.active_tasks.items()
-            }
+            }),
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters from the latest snapshot; never blocks on the manager lock."""
+        return {**self._snapshot.stats, "uptime_seconds": int(time.time() - self.start_time)}
+
+    def get_race_summary(self, username: str) -> Optional[Dict]:
+        """Vectorised per-race stats for an active task, or None if it is not active."""
+        with self.lock:
+            task = self.active_tasks.get(username)
+        return task.races.summary() if task else None
+
+    def get_active_tasks(self) -> Dict[str, Dict]:
+        """Active task summaries from the latest snapshot, as fresh dicts the caller may keep or change."""
+        return {username: dict(summary) for username, summary in self._snapshot.active_tasks.items()}
+
+    def drain(self, timeout: float = DRAIN_TIMEOUT_SECONDS) -> list:
+        """
+        Stop admitting tasks and stop every runner at its next race boundary,
+        so races in flight finish and are counted. Paused runners have no
+        race in flight and stop at once. Runners still going at the `timeout`
+        deadline are cancelled: their waits are interrupted and the unfinished
+        race is not counted, so `races_done` is exact when checkpointed.
+        Returns the unfinished tasks (stopped first, then queued, then
+        scheduled and recurring ones, which keep their timing).
+        """
+        logging.info(f"Draining AutoTyperBotManager (deadline {timeout}s)...")
+        deadline = time.time() + timeout
+        with self.lock:
+            self.accepting = False
+            stopped = list(self.active_tasks.values())
+            for task in stopped:
+                task.active = False
+                task.resume_event.set()  # a paused runner only wakes on resume or cancel
+        self.scheduler.stop()
+
+        with self.idle:
+            while self.active_tasks and time.time() < deadline:
+                self.idle.wait(deadline - time.time())
+            for task in self.active_tasks.values():
+                logging.warning(f"[{task.username}] Still racing at the drain deadline, cancelling.")
+                task.cancel_event.set()
+            # Cancelled runners unwind within milliseconds; wait so their
+            # last race is either counted or not run at all.
+            grace = time.time() + DRAIN_CANCEL_GRACE_SECONDS
+            while self.active_tasks and time.time() < grace:
+                self.idle.wait(grace - time.time())
+            if self.active_tasks:
+                logging.error(f"Drain gave up on {len(self.active_tasks)} runner(s) that did not stop.")
+            pending = [t for t in stopped if t.races_done < t.num_races]
+            while not self.task_queue.empty():
+                pending.append(self.task_queue.get())
+            pending.extend(self.scheduled_tasks.values())
+            self.scheduled_tasks.clear()
+            self._publish_snapshot()
+        logging.info(f"Drain complete, {len(pending)} unfinished task(s) checkpointed.")
+        return pending
+
+    def save_checkpoint(self, tasks: list, filename: str = CHECKPOINT_FILE):
+        tmp = filename + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump([t.to_checkpoint() for t in tasks], f)
+        os.replace(tmp, filename)
+
+    def restore_checkpoint(self, filename: str = CHECKPOINT_FILE) -> int:
+        """Re-admit tasks left over from a previous drain. Returns how many were restored."""
+        if not os.path.isfile(filename):
+            return 0
+        with open(filename, "r") as f:
+            try:
+                entries = json.load(f)
+            except json.JSONDecodeError:
+                logging.error(f"Checkpoint {filename} is corrupt, ignoring.")
+                entries = []
+        os.remove(filename)
+        restored = sum(1 for entry in entries if self.add_task(BotTask.from_checkpoint(entry)))
+        logging.info(f"Restored {restored} task(s) from {filename}.")
+        return restored
 
     def shutdown(self):
         logging.info("Shutting down AutoTyperBotManager...")
         self.running = False
+        config.unsubscribe(self._on_config_change)
+        self.scheduler.stop()
         with self.lock:
             for task in self.active_tasks.values():
                 task.active = False
@@ -285,6 +614,15 @@ class AutoTyperBotManager:
 # ---- MAIN ENTRY POINT ----
 if __name__ == "__main__":
     manager = AutoTyperBotManager()
+    manager.restore_checkpoint()
+    config.watch()
+
+    def handle_sigterm(signum, frame):
+        manager.save_checkpoint(manager.drain())
+        manager.shutdown()
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
 
     # Sample tasks for testing
     sample_tasks = [
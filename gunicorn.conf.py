@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+from utils.config import RuntimeConfig
+
+# --- Serving ---
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("WEB_THREADS", 4))
+worker_class = "gthread"
+# Import the app in each worker, after fork, so locks, leases and threads are per-process
+preload_app = False
+
+# Leave room for app.drain() to let in-flight races finish on shutdown
+graceful_timeout = RuntimeConfig().DRAIN_TIMEOUT_SECONDS + 5
+
+
+def post_worker_init(worker):
+    from app import start_background
+    start_background()
+
+
+def worker_exit(server, worker):
+    from app import drain
+    drain()
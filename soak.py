@@ -0,0 +1,268 @@
+"""
+Long-running soak harness for the Flask task runners (app.py) and the
+AutoTyperBotManager (bot.py).
+
+Both are driven against a simulated Nitrotype backend on a dilated clock,
+so hours of virtual time pass in seconds of wall time. RSS, tracemalloc
+totals, thread counts and queue depths are sampled periodically; the run
+fails (exit status 1) if any of them keeps growing after warm-up.
+
+    python soak.py --hours 6 --speedup 1000
+    python soak.py --target bot --hours 24
+"""
+import argparse
+import contextlib
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time as _time
+import tracemalloc
+from statistics import mean
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+WARMUP_FRACTION = 0.25
+GROWTH_TOLERANCE = 0.10  # late-window mean may exceed the early-window mean by 10%...
+GROWTH_FLOORS = {  # ...or by this absolute amount, whichever is larger
+    "rss_kb": 4096,
+    "traced_kb": 1024,
+    "threads": 2,
+    "app_runner_threads": 1,
+    "app_hot_tasks": 10,
+    "app_tracked_logs": 10,
+    "bot_active": 1,
+    "bot_queued": 3,
+}
+LOGIN_FAILURE_RATE = 0.05
+
+
+class DilatedTime:
+    """
+    Stand-in for the `time` module inside app.py and bot.py: time() runs
+    `speedup` times faster than the wall clock and sleep() is shortened to
+    match. Everything else is the real time module. wait_for() replaces
+    utils.clock.wait_for, the runners' interruptible sleep, the same way.
+    """
+
+    def __init__(self, speedup):
+        self.speedup = speedup
+        self._wall_start = _time.time()
+        self._mono_start = _time.monotonic()
+
+    def time(self):
+        return self._wall_start + (_time.monotonic() - self._mono_start) * self.speedup
+
+    def sleep(self, seconds):
+        _time.sleep(max(0.0, seconds) / self.speedup)
+
+    def wait_for(self, event, seconds):
+        return event.wait(max(0.0, seconds) / self.speedup)
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+
+def read_rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource  # peak rather than current RSS, but still catches runaway growth
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# ==================== Drivers ====================
+
+def install_simulated_backend(bot):
+    class SimulatedNitrotypeAPI(bot.NitrotypeAPI):
+        def login(self):
+            bot.time.sleep(1.0)
+            self.logged_in = random.random() >= LOGIN_FAILURE_RATE
+            return self.logged_in
+
+        def solve_captcha(self):
+            return True
+
+    bot.NitrotypeAPI = SimulatedNitrotypeAPI
+
+
+def drive_app(app, clock, stop, keys):
+    client = app.app.test_client()
+    while not stop.is_set():
+        for key in keys:
+            client.post("/submit", data={
+                "username": f"soak-{random.randrange(10**6)}",
+                "password": "soak-password",
+                "avg_wpm": random.randint(40, 150),
+                "min_accuracy": random.randint(85, 97),
+                "how_many_races": random.randint(1, 6),
+                "subscription_key": key,
+            })
+        tasks = client.get("/api/tasks").get_json() or []
+        client.get("/api/stats")
+        for t in tasks[:3]:
+            client.get(f"/api/task/{t['id']}/logs")
+            client.get(f"/api/task/{t['id']}/races")
+        client.get(f"/api/usage?key={keys[0]}")
+        clock.sleep(60)
+
+
+def drive_bot(bot, manager, clock, stop):
+    n = 0
+    while not stop.is_set():
+        if manager.task_queue.qsize() < 5:
+            n += 1
+            manager.add_task(bot.BotTask(f"soak{n}", "soak-password", random.randint(40, 150),
+                                         random.randint(85, 97), random.randint(1, 6), "SUBSCRIPTION_KEY_123"))
+        clock.sleep(20)
+
+
+# ==================== Sampling & Verdict ====================
+
+def take_sample(app, manager):
+    current, _ = tracemalloc.get_traced_memory()
+    sample = {
+        "rss_kb": read_rss_kb(),
+        "traced_kb": current // 1024,
+        "threads": threading.active_count(),
+    }
+    if app is not None:
+        with app.running_threads_lock:
+            sample["app_runner_threads"] = len(app.running_threads)
+        sample["app_hot_tasks"] = len(app.task_manager.get_all_tasks())
+        sample["app_tracked_logs"] = len(app.task_logs._line_counts)
+    if manager is not None:
+        stats = manager.get_stats()
+        sample["bot_active"] = stats["active_tasks"]
+        sample["bot_queued"] = stats["queued_tasks"]
+    return sample
+
+
+def take_snapshot():
+    # Leave out tracemalloc's own bookkeeping
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+def find_growth(samples):
+    """Metrics whose late-window mean exceeds the early-window mean by more than the allowance."""
+    steady = samples[int(len(samples) * WARMUP_FRACTION):]
+    third = max(1, len(steady) // 3)
+    leaks = {}
+    for name, floor in GROWTH_FLOORS.items():
+        if name not in steady[0]:
+            continue
+        values = [s[name] for s in steady]
+        early, late = mean(values[:third]), mean(values[-third:])
+        if late - early > max(abs(early) * GROWTH_TOLERANCE, floor):
+            leaks[name] = (early, late)
+    return leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=6.0, help="virtual hours to run (default 6)")
+    parser.add_argument("--speedup", type=float, default=1000.0, help="virtual seconds per wall second (default 1000)")
+    parser.add_argument("--sample-every", type=float, default=600.0, help="virtual seconds between samples (default 600)")
+    parser.add_argument("--target", choices=["app", "bot", "both"], default="both")
+    parser.add_argument("--keys", type=int, default=3, help="subscription keys driving app.py (default 3)")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch directory")
+    parser.add_argument("--verbose", action="store_true", help="show runner output")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="autotyper-soak-")
+    os.chdir(workdir)  # every store, log and lock file lands in the scratch directory
+    sys.path.insert(0, REPO_DIR)
+    tracemalloc.start()
+    clock = DilatedTime(args.speedup)
+    from utils import clock as runner_clock
+    runner_clock.wait_for = clock.wait_for
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+
+    app = manager = None
+    stop = threading.Event()
+    drivers = []
+    with quiet:
+        if args.target in ("bot", "both"):
+            import bot
+            logging.getLogger().setLevel(logging.WARNING if args.verbose else logging.CRITICAL)
+            bot.time = clock
+            install_simulated_backend(bot)
+            manager = bot.AutoTyperBotManager()
+            drivers.append(threading.Thread(target=drive_bot, args=(bot, manager, clock, stop), daemon=True))
+        if args.target in ("app", "both"):
+            # Archive as soon as the dispatcher's housekeeping runs; its
+            # age check reads the real clock, not the dilated one
+            os.environ.setdefault("ARCHIVE_AFTER_MINUTES", "0")
+            import app
+            app.time = clock
+            keys = [f"SOAKKEY{i}" for i in range(args.keys)]
+            with open(app.KEYS_FILE, "w") as f:
+                f.write("[" + ",".join(f'"{k}"' for k in keys) + "]")
+            app.start_background()  # takes the scheduler lease and dispatches like a real worker
+            drivers.append(threading.Thread(target=drive_app, args=(app, clock, stop, keys), daemon=True))
+
+        for d in drivers:
+            d.start()
+        # Count samples rather than watching the clock, so slow sampling
+        # (e.g. the tracemalloc snapshot) cannot eat into the sample count
+        total = max(1, int(args.hours * 3600 / args.sample_every))
+        samples = []
+        baseline = None
+        for i in range(total):
+            clock.sleep(args.sample_every)
+            samples.append(take_sample(app, manager))
+            if i == int(total * WARMUP_FRACTION):
+                baseline = take_snapshot()
+
+        stop.set()
+        work = {}
+        if app is not None:
+            app.drain(timeout=5)
+            work["app tasks archived"] = app.task_manager.archive.summary()["tasks"]
+        if manager is not None:
+            manager.drain(timeout=5)
+            manager.shutdown()
+            work["bot races"] = manager.get_stats()["total_races_botted"]
+
+    print(f"Soak: {(clock.time() - clock._wall_start) / 3600:.1f}h virtual in {_time.monotonic() - clock._mono_start:.1f}s wall, {len(samples)} samples")
+    print("Work done: " + ", ".join(f"{name} {n}" for name, n in work.items()))
+    names = list(samples[0]) if samples else []
+    print(f"{'metric':<20}{'first':>12}{'min':>12}{'max':>12}{'last':>12}")
+    for name in names:
+        values = [s[name] for s in samples]
+        print(f"{name:<20}{values[0]:>12}{min(values):>12}{max(values):>12}{values[-1]:>12}")
+
+    if baseline is not None:
+        print("\nTop allocation growth since warm-up:")
+        for stat in take_snapshot().compare_to(baseline, "lineno")[:10]:
+            print(f"  {stat}")
+
+    if not args.keep:
+        os.chdir(REPO_DIR)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if len(samples) < 8:
+        print("\nToo few samples to judge growth; run longer or sample more often.")
+        return 2
+    if not all(work.values()):
+        # A stalled workload cannot leak, so a PASS would mean nothing
+        print("\nNo work completed; the runners did not keep up with the virtual clock.")
+        return 2
+    leaks = find_growth(samples)
+    if leaks:
+        print("\nFAIL: unbounded growth detected")
+        for name, (early, late) in leaks.items():
+            print(f"  {name}: {early:.1f} -> {late:.1f}")
+        return 1
+    print("\nPASS: no unbounded growth detected")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
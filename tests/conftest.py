@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repo root (app.py, bot.py, utils/) rather than in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def app_module(tmp_path_factory):
+    """app.py imported inside a scratch directory, since it keeps its stores in the working directory."""
+    os.chdir(tmp_path_factory.mktemp("app"))
+    import app
+    return app
+
+
+@pytest.fixture
+def app(app_module):
+    """The app module holding the scheduler lease, with an empty task store; drain state is undone afterwards."""
+    app_module.task_manager.save_tasks([])
+    app_module.leader_lease.try_acquire()
+    yield app_module
+    for control in list(app_module.task_controls.values()):
+        control.cancel()
+    app_module.draining.clear()
+    app_module.task_scheduler.start()
+    app_module.leader_lease.release()
+
+
+def make_task(app, **fields):
+    task = {
+        "id": app.generate_task_id(), "username": "tester", "password": "pw", "avg_wpm": 80,
+        "min_accuracy": 95, "how_many_races": 5, "subscription_key": "TESTKEY",
+        "status": app.TASK_STATUS_QUEUED, "created_at": app.iso_now(), "races_botted": 0,
+    }
+    task.update(fields)
+    app.task_manager.add_task(task)
+    return task
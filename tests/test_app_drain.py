@@ -0,0 +1,30 @@
+import time
+
+from conftest import make_task
+
+
+def wait_until(predicate, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_drain_cancels_runners_that_miss_the_deadline(app, monkeypatch):
+    monkeypatch.setitem(app.config._values, "SIMULATED_RACE_SECONDS", 60.0)
+    task = make_task(app)
+    app.start_task_threads(app.task_manager)
+    assert wait_until(lambda: app.task_manager.get_task(task["id"])["status"] == app.TASK_STATUS_RUNNING)
+    with app.running_threads_lock:
+        threads = list(app.running_threads)
+
+    summary = app.drain(timeout=0.2)
+
+    assert summary["timed_out"] == [task["id"]]
+    assert not any(t.is_alive() for t in threads)
+    stored = app.task_manager.get_task(task["id"])
+    assert stored["status"] == app.TASK_STATUS_QUEUED
+    assert stored["races_botted"] == 0
+    assert not app.leader_lease.is_held()
@@ -0,0 +1,51 @@
+import json
+
+from utils.archive import TaskArchive
+
+
+def task(task_id, finished_at, key="K", races=3):
+    return {"id": task_id, "subscription_key": key, "created_at": finished_at,
+            "finished_at": finished_at, "races_botted": races, "password": "secret"}
+
+
+def test_tasks_are_filed_by_day_and_indexed(tmp_path):
+    archive = TaskArchive(str(tmp_path / "archive"))
+    archive.append([task("a", "2026-01-01T10:00:00Z"), task("b", "2026-01-02T10:00:00Z", races=5)])
+    archive.append([task("c", "2026-01-02T23:00:00Z")])
+    assert archive.partitions() == ["2026-01-01", "2026-01-02"]
+    assert archive.summary() == {"tasks": 3, "races": 11}
+    assert [t["id"] for t in archive.iter_tasks()] == ["a", "b", "c"]
+
+
+def test_iter_tasks_filters_by_key_and_inclusive_range(tmp_path):
+    archive = TaskArchive(str(tmp_path / "archive"))
+    archive.append([
+        task("a", "2026-01-01T10:00:00Z"),
+        task("b", "2026-01-02T10:00:00Z"),
+        task("c", "2026-01-02T12:30:00.500000Z", key="OTHER"),
+        task("d", "2026-01-03T00:00:00Z"),
+    ])
+    assert [t["id"] for t in archive.iter_tasks(subscription_key="K", start="2026-01-02")] == ["b", "d"]
+    assert [t["id"] for t in archive.iter_tasks(end="2026-01-02")] == ["a", "b", "c"]
+    assert [t["id"] for t in archive.iter_tasks(start="2026-01-02T12:30:00", end="2026-01-02T12:30:00")] == ["c"]
+
+
+def test_drop_before_removes_old_partitions_and_their_totals(tmp_path):
+    archive = TaskArchive(str(tmp_path / "archive"))
+    archive.append([task("a", "2026-01-01T10:00:00Z"), task("b", "2026-01-03T10:00:00Z")])
+    assert archive.drop_before("2026-01-02") == 1
+    assert archive.drop_before("2026-01-02") == 0
+    assert archive.partitions() == ["2026-01-03"]
+    assert archive.summary() == {"tasks": 1, "races": 3}
+
+
+def test_history_endpoint_validates_bounds(app, monkeypatch):
+    monkeypatch.setattr(app.subscription_manager, "is_valid_key", lambda key: key == "K")
+    app.task_manager.archive.append([task("a", "2026-01-01T10:00:00Z"), task("b", "2026-01-02T10:00:00Z")])
+    client = app.app.test_client()
+    assert client.get("/api/history?key=K&from=yesterday").status_code == 400
+    assert client.get("/api/history?key=K&to=2026-13-01").status_code == 400
+    response = client.get("/api/history?key=K&from=2026-01-02T11:00:00%2B02:00&to=2026-01-02")
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [r["id"] for r in rows] == ["b"]
+    assert "password" not in rows[0]
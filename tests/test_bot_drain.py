@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+import bot
+
+
+class InstantAPI(bot.NitrotypeAPI):
+    """Logs in at once; each race takes `race_seconds` unless interrupted."""
+    race_seconds = 0.05
+    interrupted = 0
+
+    def login(self):
+        self.logged_in = True
+        return True
+
+    def solve_captcha(self):
+        return True
+
+    def start_race(self, avg_wpm, min_acc):
+        if self._wait(self.race_seconds):
+            InstantAPI.interrupted += 1
+            return False
+        self.last_result = (avg_wpm, min_acc, self.race_seconds)
+        return True
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(bot, "NitrotypeAPI", InstantAPI)
+    manager = bot.AutoTyperBotManager()
+    yield manager
+    manager.shutdown()
+
+
+def wait_until(predicate, timeout=3):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_drain_lets_the_race_in_flight_finish(manager, monkeypatch):
+    monkeypatch.setattr(InstantAPI, "race_seconds", 0.3)
+    monkeypatch.setattr(InstantAPI, "interrupted", 0)
+    task = bot.BotTask("racing", "pw", 80, 95, 1000, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(task)
+    assert wait_until(lambda: task.races_done >= 1)
+    started = time.monotonic()
+    pending = manager.drain(timeout=5)
+    assert time.monotonic() - started < 1
+    assert pending == [task]
+    assert InstantAPI.interrupted == 0
+    assert not task.cancel_event.is_set()
+
+
+def test_drain_cancels_races_still_running_at_the_deadline(manager, monkeypatch):
+    monkeypatch.setattr(InstantAPI, "race_seconds", 10)
+    monkeypatch.setattr(InstantAPI, "interrupted", 0)
+    task = bot.BotTask("slow", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(task)
+    started = time.monotonic()
+    assert manager.drain(timeout=0.2) == [task]
+    assert time.monotonic() - started < 2
+    assert task.races_done == 0
+    assert wait_until(lambda: InstantAPI.interrupted == 1)
+
+
+def test_drain_stops_a_paused_task_at_once(manager):
+    task = bot.BotTask("paused", "pw", 80, 95, 1000, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(task)
+    assert wait_until(lambda: task.races_done >= 2)
+    manager.pause_task("paused")
+    started = time.monotonic()
+    pending = manager.drain(timeout=5)
+    assert time.monotonic() - started < 1
+    assert pending == [task]
+    assert manager.get_active_tasks() == {}
+    # A checkpoint resumes from the last counted race
+    assert bot.BotTask.from_checkpoint(task.to_checkpoint()).races_done == task.races_done
+
+
+def test_drain_checkpoints_queued_and_scheduled_tasks(manager, monkeypatch):
+    monkeypatch.setattr(InstantAPI, "race_seconds", 10)
+    monkeypatch.setitem(bot.config._values, "MAX_CONCURRENT_TASKS", 1)
+    running = bot.BotTask("running", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    queued = bot.BotTask("queued", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    recurring = bot.BotTask("recurring", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(running)
+    assert manager.add_task(queued)
+    assert manager.add_task(recurring, start_at=time.time() + 3600, repeat_every=86400, repeat_count=3)
+
+    pending = manager.drain(timeout=0.1)
+    assert [t.username for t in pending] == ["running", "queued", "recurring"]
+    restored = bot.BotTask.from_checkpoint(pending[2].to_checkpoint())
+    assert (restored.repeat_every, restored.repeat_count) == (86400, 3)
+    assert manager.scheduled_tasks == {}
+
+
+def test_scheduled_add_after_drain_is_rejected(manager):
+    manager.drain(timeout=0.1)
+    task = bot.BotTask("late", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    assert not manager.add_task(task, start_at=time.time() + 3600)
+    assert manager.scheduled_tasks == {}
+    assert len(manager.scheduler) == 0
+
+
+def test_shutdown_unsubscribes_from_config():
+    manager = bot.AutoTyperBotManager()
+    assert manager._on_config_change in bot.config._listeners
+    manager.shutdown()
+    assert manager._on_config_change not in bot.config._listeners
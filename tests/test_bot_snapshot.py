@@ -0,0 +1,37 @@
+import pytest
+
+import bot
+
+
+@pytest.fixture
+def manager():
+    manager = bot.AutoTyperBotManager()
+    yield manager
+    manager.shutdown()
+
+
+def test_readers_cannot_change_the_snapshot(manager):
+    task = bot.BotTask("watched", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(task)  # still logging in while the test runs
+    try:
+        active = manager.get_active_tasks()
+        active["watched"]["races_done"] = 99
+        active.clear()
+        assert manager.get_active_tasks()["watched"]["races_done"] == 0
+        with pytest.raises(TypeError):
+            manager._snapshot.active_tasks["watched"]["races_done"] = 99
+        stats = manager.get_stats()
+        stats["active_tasks"] = 42
+        assert manager.get_stats()["active_tasks"] == 1
+    finally:
+        manager.cancel_task("watched")
+
+
+def test_snapshot_follows_state_changes(manager):
+    task = bot.BotTask("watched", "pw", 80, 95, 5, "SUBSCRIPTION_KEY_123")
+    assert manager.add_task(task)
+    assert manager.pause_task("watched")
+    assert manager.get_active_tasks()["watched"]["paused"] is True
+    manager.cancel_task("watched")
+    assert manager.get_active_tasks() == {}
+    assert manager.get_stats()["active_tasks"] == 0
@@ -0,0 +1,74 @@
+import pytest
+
+from utils.config import SETTINGS, ConfigError, RuntimeConfig
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    for name in SETTINGS:
+        monkeypatch.delenv(name, raising=False)
+    return RuntimeConfig(env_file=str(tmp_path / ".env"))
+
+
+def test_defaults_when_no_env_file(config):
+    assert config.MAX_CONCURRENT_TASKS == 3
+    assert config.RACE_MIN_SECONDS == 5.0
+
+
+def test_validate_reports_every_problem(config):
+    with pytest.raises(ConfigError) as excinfo:
+        config.validate({"MAX_CONCURRENT_TASKS": "many", "RETRY_LIMIT": 500, "BOGUS": 1})
+    message = str(excinfo.value)
+    assert "MAX_CONCURRENT_TASKS: expected int" in message
+    assert "RETRY_LIMIT: 500 is outside 0..50" in message
+    assert "BOGUS: unknown setting" in message
+
+
+def test_race_min_must_not_exceed_race_max(config):
+    with pytest.raises(ConfigError, match="RACE_MIN_SECONDS must not exceed RACE_MAX_SECONDS"):
+        config.update({"RACE_MIN_SECONDS": 20}, persist=False)
+    assert config.RACE_MIN_SECONDS == 5.0
+
+
+def test_update_persists_and_notifies_only_changed_settings(config, tmp_path):
+    seen = []
+    config.subscribe(seen.append)
+    assert config.update({"MAX_CONCURRENT_TASKS": "8", "RETRY_LIMIT": 5}) == {"MAX_CONCURRENT_TASKS": 8}
+    assert seen == [{"MAX_CONCURRENT_TASKS": 8}]
+    assert "MAX_CONCURRENT_TASKS=8" in (tmp_path / ".env").read_text()
+    assert RuntimeConfig(env_file=str(tmp_path / ".env")).MAX_CONCURRENT_TASKS == 8
+
+
+def test_unsubscribed_listener_is_not_called(config):
+    seen = []
+    config.subscribe(seen.append)
+    config.unsubscribe(seen.append)
+    config.update({"RETRY_LIMIT": 7}, persist=False)
+    assert seen == []
+
+
+def test_env_file_overrides_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("RETRY_LIMIT", "2")
+    (tmp_path / ".env").write_text("RETRY_LIMIT=9\n")
+    assert RuntimeConfig(env_file=str(tmp_path / ".env")).RETRY_LIMIT == 9
+
+
+def test_invalid_env_file_is_ignored_on_reload(config, tmp_path):
+    (tmp_path / ".env").write_text("MAX_CONCURRENT_TASKS=0\n")
+    assert config.reload() == {}
+    assert config.MAX_CONCURRENT_TASKS == 3
+
+
+def test_restart_only_settings_are_validated_but_not_changed_live(config, tmp_path):
+    with pytest.raises(ConfigError, match="PROGRESS_FLUSH_SECONDS: only read at startup"):
+        config.update({"PROGRESS_FLUSH_SECONDS": 1.0})
+    (tmp_path / ".env").write_text("PROGRESS_FLUSH_SECONDS=1.0\nRETRY_LIMIT=9\n")
+    assert config.reload() == {"RETRY_LIMIT": 9}
+    assert config.PROGRESS_FLUSH_SECONDS == 0.25
+    assert RuntimeConfig(env_file=str(tmp_path / ".env")).PROGRESS_FLUSH_SECONDS == 1.0
+
+
+def test_bad_restart_only_value_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setenv("DRAIN_TIMEOUT_SECONDS", "soon")
+    with pytest.raises(ConfigError, match="DRAIN_TIMEOUT_SECONDS: expected int"):
+        RuntimeConfig(env_file=str(tmp_path / ".env"))
@@ -0,0 +1,71 @@
+import gzip
+import re
+
+from conftest import make_task
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_large_json_is_gzipped_with_its_own_etag(app):
+    for _ in range(10):
+        make_task(app)
+    client = app.app.test_client()
+    plain = client.get("/api/tasks")
+    zipped = client.get("/api/tasks", headers=GZIP)
+    assert "Content-Encoding" not in plain.headers
+    assert zipped.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped.get_data()) == plain.get_data()
+    assert zipped.get_etag()[0] == plain.get_etag()[0] + "-gz"
+    assert "Accept-Encoding" in zipped.headers["Vary"]
+
+
+def test_small_bodies_are_not_gzipped(app):
+    response = app.app.test_client().get("/api/tasks", headers=GZIP)
+    assert len(response.get_data()) < 1024
+    assert "Content-Encoding" not in response.headers
+
+
+def test_304_only_for_the_matching_representation(app):
+    for _ in range(10):
+        make_task(app)
+    client = app.app.test_client()
+    plain_etag = client.get("/api/tasks").headers["ETag"]
+    zipped_etag = client.get("/api/tasks", headers=GZIP).headers["ETag"]
+
+    assert client.get("/api/tasks", headers={"If-None-Match": plain_etag}).status_code == 304
+    assert client.get("/api/tasks", headers={**GZIP, "If-None-Match": zipped_etag}).status_code == 304
+    mismatched = client.get("/api/tasks", headers={**GZIP, "If-None-Match": plain_etag})
+    assert mismatched.status_code == 200
+    assert mismatched.headers["Content-Encoding"] == "gzip"
+
+    make_task(app)
+    assert client.get("/api/tasks", headers={"If-None-Match": plain_etag}).status_code == 200
+
+
+def test_cached_page_revalidates(app):
+    client = app.app.test_client()
+    first = client.get("/tasks", headers=GZIP)
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert first.get_etag()[0].endswith("-gz")
+    again = client.get("/tasks", headers={**GZIP, "If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    plain = client.get("/tasks", headers={"If-None-Match": first.headers["ETag"]})
+    assert plain.status_code == 200
+    assert gzip.decompress(first.get_data()) == plain.get_data()
+
+
+def test_hashed_asset_url_is_served_immutable(app):
+    client = app.app.test_client()
+    page = client.get("/").get_data(as_text=True)
+    url = re.search(r'href="(/assets/css/styles\.[0-9a-f]{12}\.css)"', page).group(1)
+    with open(app.app.static_folder + "/css/styles.css", "rb") as f:
+        raw = f.read()
+
+    asset = client.get(url)
+    assert asset.get_data() == raw
+    assert "immutable" in asset.headers["Cache-Control"]
+    zipped = client.get(url, headers=GZIP)
+    assert gzip.decompress(zipped.get_data()) == raw
+    assert zipped.get_etag()[0] == asset.get_etag()[0] + "-gz"
+    assert client.get(url, headers={"If-None-Match": asset.headers["ETag"]}).status_code == 304
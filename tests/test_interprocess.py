@@ -0,0 +1,75 @@
+import multiprocessing
+
+from conftest import make_task
+from utils.interprocess import InterProcessLock
+
+fork = multiprocessing.get_context("fork")
+
+
+def bump_counter(lock_path, counter_path, times):
+    lock = InterProcessLock(lock_path)
+    for _ in range(times):
+        with lock:
+            with open(counter_path) as f:
+                value = int(f.read())
+            with open(counter_path, "w") as f:
+                f.write(str(value + 1))
+
+
+def test_lock_excludes_other_processes(tmp_path):
+    lock_path, counter_path = str(tmp_path / "c.lock"), str(tmp_path / "counter")
+    with open(counter_path, "w") as f:
+        f.write("0")
+    workers = [fork.Process(target=bump_counter, args=(lock_path, counter_path, 200)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(30)
+    with open(counter_path) as f:
+        assert int(f.read()) == 800
+
+
+def try_acquire(lock, results):
+    results.put(lock.acquire(blocking=False))
+
+
+def test_nonblocking_acquire_fails_while_another_process_holds_it(tmp_path):
+    lock = InterProcessLock(str(tmp_path / "c.lock"))
+    results = fork.Queue()
+    with lock:
+        # the child inherits this open lock; it must still be excluded
+        child = fork.Process(target=try_acquire, args=(lock, results))
+        child.start()
+        child.join(10)
+        assert results.get(timeout=5) is False
+        assert lock.acquire(timeout=0.05) is False
+    child = fork.Process(target=try_acquire, args=(InterProcessLock(lock.path), results))
+    child.start()
+    child.join(10)
+    assert results.get(timeout=5) is True
+
+
+def add_one(app, results):
+    task = {"id": app.generate_task_id(), "subscription_key": "SHARED", "status": app.TASK_STATUS_QUEUED}
+    results.put(app.task_manager.add_task_if_under_limit(task, 3))
+
+
+def test_add_task_if_under_limit_across_processes(app):
+    make_task(app, subscription_key="SHARED")
+    results = fork.Queue()
+    workers = [fork.Process(target=add_one, args=(app, results)) for _ in range(6)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(30)
+    admitted = [results.get(timeout=5) for _ in workers]
+    assert admitted.count(True) == 2
+    assert app.task_manager.count_key_usage("SHARED") == 3
+
+
+def test_add_task_if_under_limit_ignores_finished_tasks(app):
+    make_task(app, subscription_key="K", status=app.TASK_STATUS_COMPLETED)
+    task = {"id": app.generate_task_id(), "subscription_key": "K", "status": app.TASK_STATUS_QUEUED}
+    assert app.task_manager.add_task_if_under_limit(task, 1) is True
+    again = dict(task, id=app.generate_task_id())
+    assert app.task_manager.add_task_if_under_limit(again, 1) is False
@@ -0,0 +1,42 @@
+import os
+
+from conftest import make_task
+from utils.locks import StripedLock
+
+
+def test_same_key_always_gets_the_same_lock():
+    locks = StripedLock("test_same_key", stripes=8)
+    assert len(locks) == 8
+    assert locks("task-1") is locks("task-1")
+
+
+def test_keys_spread_across_stripes():
+    locks = StripedLock("test_spread", stripes=8)
+    used = {id(locks(f"task-{i}")) for i in range(200)}
+    assert len(used) == 8
+
+
+def test_single_stripe_is_one_global_lock():
+    locks = StripedLock("test_single", stripes=1)
+    assert locks("a") is locks("b")
+
+
+def test_parsed_store_is_reused_until_the_file_changes(app, monkeypatch):
+    make_task(app)
+    monkeypatch.setattr(app, "STORE_CACHE_SLACK_NS", 0)
+    first = app.task_manager._cached_tasks()
+    assert app.task_manager._cached_tasks() is first
+    loaded = app.task_manager.load_tasks()
+    loaded[0]["status"] = "tampered"  # callers get copies
+    assert app.task_manager.get_all_tasks()[0]["status"] == app.TASK_STATUS_QUEUED
+    make_task(app)
+    assert len(app.task_manager._cached_tasks()) == 2
+
+
+def test_rewrite_within_a_clock_tick_is_not_served_stale(app):
+    task = make_task(app, status=app.TASK_STATUS_QUEUED)
+    assert app.task_manager.get_task(task["id"])["status"] == app.TASK_STATUS_QUEUED
+    stat = os.stat(app.task_manager.tasks_file)
+    app.task_manager.update_task(task["id"], status="failed")  # same length as "queued"
+    os.utime(app.task_manager.tasks_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert app.task_manager.get_task(task["id"])["status"] == "failed"
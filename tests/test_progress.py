@@ -0,0 +1,59 @@
+import threading
+import time
+
+from utils.progress import ProgressWriter
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.flushed = threading.Event()
+
+    def __call__(self, batch):
+        self.batches.append(batch)
+        self.flushed.set()
+
+
+def test_updates_within_a_window_are_merged_into_one_batch():
+    recorder = Recorder()
+    writer = ProgressWriter(recorder, flush_window=0.1)
+    writer.publish("a", races_botted=1)
+    writer.publish("a", races_botted=2, status="running")
+    writer.publish("b", races_botted=5)
+    assert recorder.flushed.wait(2)
+    writer.stop()
+    assert recorder.batches == [{"a": {"races_botted": 2, "status": "running"}, "b": {"races_botted": 5}}]
+    assert writer.stats() == {"events": 3, "batches": 1, "pending_tasks": 0}
+
+
+def test_flush_writes_pending_updates_immediately():
+    recorder = Recorder()
+    writer = ProgressWriter(recorder, flush_window=60)
+    writer.publish("a", races_botted=3)
+    assert writer.flush() == 1
+    assert recorder.batches == [{"a": {"races_botted": 3}}]
+    assert writer.flush() == 0
+    writer.stop()
+    assert len(recorder.batches) == 1
+
+
+def test_stop_mid_window_returns_promptly_and_keeps_the_update():
+    recorder = Recorder()
+    writer = ProgressWriter(recorder, flush_window=30)
+    writer.publish("a", races_botted=7)
+    started = time.monotonic()
+    writer.stop()
+    assert time.monotonic() - started < 1
+    assert recorder.batches == [{"a": {"races_botted": 7}}]
+    assert not writer._thread.is_alive()
+
+
+def test_failed_flush_is_logged_not_raised():
+    def broken(batch):
+        raise OSError("disk full")
+
+    writer = ProgressWriter(broken, flush_window=60)
+    writer.publish("a", races_botted=1)
+    assert writer.flush() == 1
+    assert writer.stats()["batches"] == 0
+    writer.stop()
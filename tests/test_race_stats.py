@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from utils import race_stats
+from utils.race_stats import RECORD, RaceSeries, RaceStore
+
+
+def random_series(count, seed):
+    rng = random.Random(seed)
+    series = RaceSeries()
+    ts = 1_700_000_000.0
+    for _ in range(count):
+        ts += rng.uniform(20, 90)
+        series.append(ts, rng.uniform(40, 160), rng.uniform(85, 100), rng.uniform(15, 60),
+                      rng.choice((1, 1, 1, 2, 3)))
+    return series
+
+
+@pytest.mark.parametrize("count,seed", [(1, 0), (2, 1), (7, 2), (500, 3), (20000, 4), (100000, 5)])
+def test_numpy_and_pure_python_summaries_agree(monkeypatch, count, seed):
+    pytest.importorskip("numpy")
+    series = random_series(count, seed)
+    monkeypatch.setattr(race_stats, "_np", None)
+    with_numpy = series.summary()
+    monkeypatch.setattr(race_stats, "_np", False)
+    pure = series.summary()
+    assert pure.keys() == with_numpy.keys()
+    assert pure.pop("accuracy_distribution") == with_numpy.pop("accuracy_distribution")
+    assert pure == pytest.approx(with_numpy, abs=0.011)
+
+
+def test_empty_series_summary():
+    assert RaceSeries().summary() == {"races": 0}
+
+
+def test_store_round_trip_ignores_a_torn_record(tmp_path):
+    store = RaceStore(str(tmp_path / "races"))
+    store.append("t1", 1000.0, 101.5, 97.25, 31.0)
+    store.append("t1", 1060.0, 99.0, 98.0, 29.5, attempt=2)
+    with open(store._path("t1"), "ab") as f:
+        f.write(RECORD.pack(1120.0, 1.0, 1.0, 1.0, 1)[:-3])
+
+    series = store.load("t1")
+    assert series.rows() == [
+        {"timestamp": 1000.0, "wpm": 101.5, "accuracy": 97.25, "duration": 31.0, "attempt": 1},
+        {"timestamp": 1060.0, "wpm": 99.0, "accuracy": 98.0, "duration": 29.5, "attempt": 2},
+    ]
+    assert series.summary()["retried_races"] == 1
+    assert len(store.load("missing")) == 0
+    store.remove("t1")
+    assert len(store.load("t1")) == 0
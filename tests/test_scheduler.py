@@ -0,0 +1,89 @@
+import threading
+import time
+
+from utils.scheduler import TaskScheduler
+
+
+class Fired:
+    def __init__(self, expected):
+        self.items = []
+        self.expected = expected
+        self.done = threading.Event()
+
+    def __call__(self, item):
+        self.items.append(item)
+        if len(self.items) >= self.expected:
+            self.done.set()
+
+
+def test_items_fire_in_due_order():
+    fired = Fired(3)
+    scheduler = TaskScheduler(fired)
+    now = time.time()
+    scheduler.schedule(now + 0.3, "c")
+    scheduler.schedule(now + 0.1, "a")
+    scheduler.schedule(now + 0.2, "b")
+    assert fired.done.wait(3)
+    scheduler.stop()
+    assert fired.items == ["a", "b", "c"]
+    assert len(scheduler) == 0
+
+
+def test_cancelled_item_never_fires():
+    fired = Fired(1)
+    scheduler = TaskScheduler(fired)
+    now = time.time()
+    scheduler.schedule(now + 0.1, "gone")
+    scheduler.schedule(now + 0.2, "kept")
+    assert scheduler.cancel("gone")
+    assert not scheduler.cancel("gone")
+    assert "gone" not in scheduler
+    assert scheduler.next_due() == now + 0.2
+    assert fired.done.wait(3)
+    time.sleep(0.2)
+    scheduler.stop()
+    assert fired.items == ["kept"]
+
+
+def test_reschedule_replaces_the_earlier_due_time():
+    fired = Fired(2)
+    scheduler = TaskScheduler(fired)
+    now = time.time()
+    scheduler.schedule(now + 0.1, "moved")
+    scheduler.schedule(now + 0.2, "other")
+    scheduler.schedule(now + 0.3, "moved")
+    assert len(scheduler) == 2
+    assert fired.done.wait(3)
+    time.sleep(0.2)
+    scheduler.stop()
+    assert fired.items == ["other", "moved"]
+
+
+def test_failing_callback_does_not_stop_the_scheduler():
+    fired = Fired(1)
+
+    def callback(item):
+        if item == "bad":
+            raise RuntimeError("boom")
+        fired(item)
+
+    scheduler = TaskScheduler(callback)
+    now = time.time()
+    scheduler.schedule(now + 0.05, "bad")
+    scheduler.schedule(now + 0.1, "good")
+    assert fired.done.wait(3)
+    scheduler.stop()
+    assert fired.items == ["good"]
+
+
+def test_schedule_does_not_restart_a_stopped_scheduler():
+    fired = Fired(1)
+    scheduler = TaskScheduler(fired)
+    scheduler.schedule(time.time() + 60, "first")
+    scheduler.stop()
+    scheduler.schedule(time.time(), "late")
+    assert not fired.done.wait(0.3)
+    scheduler.start()
+    assert fired.done.wait(3)
+    scheduler.stop()
+    assert fired.items == ["late"]
@@ -0,0 +1,49 @@
+import json
+import os
+
+from conftest import make_task
+from utils.snapshot import load_snapshot, save_snapshot, task_header, header_dict
+
+
+def write_store(path, tasks):
+    with open(path, "w") as f:
+        json.dump(tasks, f)
+
+
+def test_round_trip_while_the_store_is_unchanged(tmp_path):
+    store, snap = str(tmp_path / "tasks.json"), str(tmp_path / "tasks.snapshot")
+    tasks = [{"id": "a", "status": "queued", "subscription_key": "K", "races_botted": 1, "how_many_races": 5}]
+    write_store(store, tasks)
+    save_snapshot(snap, store, [task_header(t) for t in tasks])
+    headers = load_snapshot(snap, store)
+    assert [header_dict(h) for h in headers] == [{
+        "id": "a", "status": "queued", "subscription_key": "K", "start_at": None,
+        "races_botted": 1, "how_many_races": 5}]
+
+
+def test_snapshot_is_stale_after_any_store_write(tmp_path):
+    store, snap = str(tmp_path / "tasks.json"), str(tmp_path / "tasks.snapshot")
+    write_store(store, [{"id": "a", "status": "queued"}])
+    save_snapshot(snap, store, [])
+    st = os.stat(store)
+    write_store(store, [{"id": "a", "status": "failed"}])  # same size
+    os.utime(store, ns=(st.st_atime_ns, st.st_mtime_ns))  # and the same mtime
+    assert load_snapshot(snap, store) is None
+
+
+def test_missing_or_corrupt_snapshot_is_ignored(tmp_path):
+    store, snap = str(tmp_path / "tasks.json"), str(tmp_path / "tasks.snapshot")
+    write_store(store, [])
+    assert load_snapshot(snap, store) is None
+    with open(snap, "wb") as f:
+        f.write(b"not a pickle")
+    assert load_snapshot(snap, store) is None
+
+
+def test_task_manager_rebuilds_a_stale_snapshot(app):
+    task = make_task(app)
+    app.task_manager.write_snapshot()
+    app.task_manager.update_task(task["id"], races_botted=4)
+    headers = app.task_manager.load_task_headers()
+    assert [(h["id"], h["races_botted"]) for h in headers] == [(task["id"], 4)]
+    assert load_snapshot(app.task_manager.snapshot_file, app.task_manager.tasks_file) is not None
@@ -0,0 +1,53 @@
+from conftest import make_task
+
+
+def post(app, task, action, key=None):
+    key = task["subscription_key"] if key is None else key
+    return app.app.test_client().post(f"/api/task/{task['id']}/{action}", data={"subscription_key": key})
+
+
+def test_control_requires_the_tasks_subscription_key(app):
+    task = make_task(app, status=app.TASK_STATUS_SCHEDULED)
+    assert post(app, task, "cancel", key="SOMEONE-ELSE").status_code == 403
+    assert post(app, task, "cancel", key="").status_code == 403
+    assert app.task_manager.get_task(task["id"])["status"] == app.TASK_STATUS_SCHEDULED
+
+
+def test_unknown_task_or_action_is_404(app):
+    task = make_task(app, status=app.TASK_STATUS_SCHEDULED)
+    assert post(app, task, "explode").status_code == 404
+    assert post(app, dict(task, id="missing"), "pause").status_code == 404
+
+
+def test_pause_records_where_it_paused_from_in_the_same_write(app):
+    task = make_task(app, status=app.TASK_STATUS_RUNNING)
+    writes = []
+    original = app.task_manager._write
+    app.task_manager._write = lambda tasks: (writes.append([dict(t) for t in tasks]), original(tasks))
+    try:
+        response = post(app, task, "pause")
+    finally:
+        app.task_manager._write = original
+    assert response.get_json()["status"] == app.TASK_STATUS_PAUSED
+    assert len(writes) == 1
+    stored = writes[0][0]
+    assert (stored["status"], stored["paused_from"]) == (app.TASK_STATUS_PAUSED, app.TASK_STATUS_RUNNING)
+
+
+def test_resume_without_a_runner_requeues(app):
+    task = make_task(app, status=app.TASK_STATUS_RUNNING)
+    post(app, task, "pause")
+    app.draining.set()  # keep start_task_threads from picking the task up
+    response = post(app, task, "resume")
+    assert response.get_json()["status"] == app.TASK_STATUS_QUEUED
+    stored = app.task_manager.get_task(task["id"])
+    assert stored["status"] == app.TASK_STATUS_QUEUED
+    assert stored["paused_from"] is None
+
+
+def test_cancel_is_final(app):
+    task = make_task(app, status=app.TASK_STATUS_SCHEDULED)
+    assert post(app, task, "cancel").get_json()["status"] == app.TASK_STATUS_CANCELLED
+    assert post(app, task, "pause").status_code == 409
+    assert post(app, task, "resume").status_code == 409
+    assert task["id"] not in app.task_scheduler
@@ -0,0 +1,52 @@
+import multiprocessing
+
+from utils import task_logs as task_logs_module
+from utils.task_logs import TaskLogStore
+
+
+def test_append_and_read_keep_order(tmp_path):
+    store = TaskLogStore(str(tmp_path), max_entries=10)
+    for i in range(3):
+        store.append("t1", f"line {i}")
+    logs = store.read({"id": "t1", "logs": [{"message": "inline"}]})
+    assert [e["message"] for e in logs] == ["inline", "line 0", "line 1", "line 2"]
+    assert [e["message"] for e in store.read({"id": "t1"}, limit=1)] == ["line 2"]
+
+
+def test_file_is_compacted_to_the_newest_entries(tmp_path):
+    store = TaskLogStore(str(tmp_path), max_entries=5)
+    for i in range(10):
+        store.append("t1", f"line {i}")
+    assert [e["message"] for e in store.read({"id": "t1"})] == [f"line {i}" for i in range(5, 10)]
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
+
+
+def test_line_counts_are_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_logs_module, "MAX_TRACKED_LOGS", 4)
+    store = TaskLogStore(str(tmp_path))
+    for i in range(20):
+        store.append(f"t{i}", "hello")
+    assert list(store._line_counts) == ["t16", "t17", "t18", "t19"]
+    store.remove("t19")
+    assert "t19" not in store._line_counts
+
+
+def _append_many(log_dir, worker, count):
+    store = TaskLogStore(log_dir, max_entries=50)
+    for i in range(count):
+        store.append("shared", f"{worker}:{i}")
+
+
+def test_concurrent_processes_lose_no_lines_across_compactions(tmp_path):
+    procs = [multiprocessing.Process(target=_append_many, args=(str(tmp_path), w, 400)) for w in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+    # Compaction keeps a suffix of the global append order, so each worker's
+    # surviving lines must be its newest ones with no gaps
+    messages = [e["message"] for e in TaskLogStore(str(tmp_path)).read({"id": "shared"})]
+    assert 50 <= len(messages) < 3 * 400
+    for w in range(3):
+        seen = sorted(int(m.split(":")[1]) for m in messages if m.startswith(f"{w}:"))
+        assert seen == list(range(400 - len(seen), 400))
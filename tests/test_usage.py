@@ -0,0 +1,58 @@
+import time
+
+from conftest import make_task
+from utils.usage import UsageRollup
+
+HOUR = 3600
+
+
+def test_query_returns_hourly_buckets_and_totals(tmp_path):
+    rollup = UsageRollup(str(tmp_path / "usage.json"))
+    now = time.time()
+    rollup.record("K", "races", ts=now - 2 * HOUR)
+    rollup.record("K", "races", 2, ts=now)
+    rollup.record("K", "busy_seconds", 4.5, ts=now)
+    rollup.record("OTHER", "races", ts=now)
+
+    usage = rollup.query("K", now - 3 * HOUR, now)
+    assert [b["races"] for b in usage["buckets"]] == [1, 2]
+    assert usage["totals"]["races"] == 3
+    assert usage["totals"]["busy_seconds"] == 4.5
+    assert rollup.query("K", now - HOUR / 2, now)["totals"]["races"] == 2
+    assert rollup.query("MISSING", 0, now)["buckets"] == []
+
+
+def test_old_hour_slot_is_recycled(tmp_path):
+    rollup = UsageRollup(str(tmp_path / "usage.json"), ring_hours=4)
+    now = time.time()
+    rollup.record("K", "races", 5, ts=now - 4 * HOUR)  # same slot as now
+    rollup.record("K", "races", ts=now)
+    usage = rollup.query("K", now - 10 * HOUR, now)
+    assert [b["races"] for b in usage["buckets"]] == [1]
+
+
+def test_readers_pick_up_saved_usage(tmp_path):
+    path = str(tmp_path / "usage.json")
+    writer, reader = UsageRollup(path), UsageRollup(path)
+    now = time.time()
+    assert reader.query("K", now - HOUR, now)["totals"]["races"] == 0
+    writer.record("K", "races", 3, ts=now)
+    writer.save()
+    assert reader.query("K", now - HOUR, now)["totals"]["races"] == 3
+    reader.save()  # nothing recorded here, so the writer's file is left alone
+    assert UsageRollup(path).query("K", now - HOUR, now)["totals"]["races"] == 3
+
+
+def test_requeued_task_is_not_counted_as_started_again(app, monkeypatch):
+    monkeypatch.setitem(app.config._values, "SIMULATED_RACE_SECONDS", 0.1)
+    now = time.time()
+    first = make_task(app, how_many_races=1, subscription_key="STARTKEY")
+    requeued = make_task(app, how_many_races=1, subscription_key="STARTKEY", started_at=app.iso_now())
+    app.start_task_threads(app.task_manager)
+    deadline = time.monotonic() + 5
+    while any(app.task_manager.get_task(t["id"])["status"] != app.TASK_STATUS_COMPLETED for t in (first, requeued)):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+    totals = app.usage_rollup.query("STARTKEY", now - HOUR, time.time())["totals"]
+    assert totals["tasks_started"] == 1
+    assert totals["tasks_finished"] == 2
@@ -0,0 +1,123 @@
+import gzip
+import json
+import os
+
+from utils.interprocess import InterProcessLock
+
+ARCHIVE_DIR = "task_archive"
+INDEX_FILE = "index.json"
+PARTITION_SUFFIX = ".jsonl.gz"
+
+
+class TaskArchive:
+    """
+    Cold storage for finished tasks: one gzip-compressed JSON-lines file per
+    UTC day. Retention drops whole partitions, and a small index keeps
+    per-day totals so stats never have to decompress history. Writers in
+    every worker process serialise on a lock file next to the archive.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+        self.lock = InterProcessLock(archive_dir.rstrip("/\\") + ".lock")
+
+    @staticmethod
+    def partition_day(task):
+        """UTC day (YYYY-MM-DD) a task is filed under: when it finished, else when it was created."""
+        return (task.get("finished_at") or task["created_at"])[:10]
+
+    def _partition_path(self, day):
+        return os.path.join(self.archive_dir, day + PARTITION_SUFFIX)
+
+    def _load_index(self):
+        path = os.path.join(self.archive_dir, INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+
+    def _save_index(self, index):
+        path = os.path.join(self.archive_dir, INDEX_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+
+    def append(self, tasks):
+        """Append finished tasks to their day partitions."""
+        if not tasks:
+            return
+        by_day = {}
+        for t in tasks:
+            by_day.setdefault(self.partition_day(t), []).append(t)
+        with self.lock:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            index = self._load_index()
+            for day, day_tasks in by_day.items():
+                # Appending adds a new gzip member; readers see one continuous stream
+                with gzip.open(self._partition_path(day), "at", encoding="utf-8") as f:
+                    for t in day_tasks:
+                        f.write(json.dumps(t, separators=(",", ":")) + "\n")
+                entry = index.setdefault(day, {"tasks": 0, "races": 0})
+                entry["tasks"] += len(day_tasks)
+                entry["races"] += sum(t.get("races_botted", 0) for t in day_tasks)
+            self._save_index(index)
+
+    def partitions(self):
+        if not os.path.isdir(self.archive_dir):
+            return []
+        return sorted(name[:-len(PARTITION_SUFFIX)] for name in os.listdir(self.archive_dir)
+                      if name.endswith(PARTITION_SUFFIX))
+
+    def drop_before(self, day):
+        """Delete every partition older than `day` (YYYY-MM-DD). Returns how many were dropped."""
+        with self.lock:
+            dropped = [d for d in self.partitions() if d < day]
+            if not dropped:
+                return 0
+            index = self._load_index()
+            for d in dropped:
+                try:
+                    os.remove(self._partition_path(d))
+                except FileNotFoundError:
+                    pass  # already dropped by another process
+                index.pop(d, None)
+            self._save_index(index)
+        return len(dropped)
+
+    def iter_tasks(self, subscription_key=None, start=None, end=None):
+        """
+        Stream archived tasks, optionally for one subscription key and/or an
+        inclusive ISO date/time range. Only partitions overlapping the range
+        are opened.
+        """
+        for day in self.partitions():
+            if start and day < start[:10]:
+                continue
+            if end and day > end[:10]:
+                break
+            try:
+                f = gzip.open(self._partition_path(day), "rt", encoding="utf-8")
+            except FileNotFoundError:
+                continue  # dropped by retention while we were streaming
+            with f:
+                for line in f:
+                    t = json.loads(line)
+                    if subscription_key and t.get("subscription_key") != subscription_key:
+                        continue
+                    ts = t.get("finished_at") or t["created_at"]
+                    if (start and ts < start) or (end and ts[:len(end)] > end):
+                        continue
+                    yield t
+
+    def summary(self):
+        """Totals across all retained partitions, from the index only."""
+        with self.lock:
+            index = self._load_index()
+        return {
+            "tasks": sum(e["tasks"] for e in index.values()),
+            "races": sum(e["races"] for e in index.values()),
+        }
@@ -0,0 +1,7 @@
+def wait_for(event, seconds):
+    """
+    Interruptible sleep shared by the app and bot runners: returns True if
+    `event` was set within `seconds`. Call it as clock.wait_for so the
+    soak harness can swap in its dilated-clock version in one place.
+    """
+    return event.wait(seconds)
@@ -0,0 +1,170 @@
+import logging
+import os
+import threading
+import time
+
+from dotenv import dotenv_values, set_key
+
+ENV_FILE = ".env"
+WATCH_INTERVAL_SECONDS = 2.0
+
+# name -> (type, default, minimum, maximum)
+SETTINGS = {
+    "MAX_CONCURRENT_TASKS": (int, 3, 1, 100),
+    "MAX_TASKS_PER_KEY": (int, 3, 1, 100),
+    "RETRY_LIMIT": (int, 5, 0, 50),
+    "TASK_PURGE_DAYS": (int, 7, 1, 3650),
+    "SIMULATED_RACE_SECONDS": (float, 4.0, 0.1, 600.0),  # app.py demo runner
+    "RACE_MIN_SECONDS": (float, 5.0, 0.1, 600.0),  # bot.py race duration range
+    "RACE_MAX_SECONDS": (float, 10.0, 0.1, 600.0),
+    # app.py, read once at startup (see RESTART_ONLY)
+    "PROGRESS_FLUSH_SECONDS": (float, 0.25, 0.01, 60.0),  # also how much progress a crash can lose
+    "DRAIN_TIMEOUT_SECONDS": (int, 30, 0, 3600),
+    "ARCHIVE_AFTER_MINUTES": (float, 10.0, 0.0, 10080.0),
+    "STORE_CACHE_SLACK_MS": (float, 100.0, 0.0, 10000.0),
+}
+# Settings baked into objects or defaults at startup; changing them needs a restart
+RESTART_ONLY = {"PROGRESS_FLUSH_SECONDS", "DRAIN_TIMEOUT_SECONDS", "ARCHIVE_AFTER_MINUTES", "STORE_CACHE_SLACK_MS"}
+
+
+class ConfigError(ValueError):
+    pass
+
+
+class RuntimeConfig:
+    """
+    Tunable settings, readable as attributes (config.MAX_CONCURRENT_TASKS).
+    Values come from the defaults above, then the process environment, then
+    the .env file; the .env file wins so that editing it (or posting to the
+    admin endpoint, which writes it) retunes a running process. Every change
+    is validated as a whole before it is applied, and subscribers are called
+    with the settings that actually changed. `restart_only` settings are
+    validated and read the same way but keep their startup value.
+    """
+
+    def __init__(self, env_file=ENV_FILE, spec=SETTINGS, restart_only=RESTART_ONLY):
+        self.env_file = env_file
+        self.spec = spec
+        self.restart_only = restart_only
+        self.lock = threading.Lock()
+        self._listeners = []
+        self._file_mtime = None
+        self._watcher = None
+        self._values = self.validate(self._collect())
+
+    def __getattr__(self, name):
+        values = self.__dict__.get("_values")
+        if values is not None and name in values:
+            return values[name]
+        raise AttributeError(name)
+
+    def as_dict(self):
+        return dict(self._values)
+
+    def _read_file(self):
+        try:
+            self._file_mtime = os.stat(self.env_file).st_mtime_ns
+        except FileNotFoundError:
+            self._file_mtime = None
+            return {}
+        return {k: v for k, v in dotenv_values(self.env_file).items() if k in self.spec and v is not None}
+
+    def _collect(self):
+        raw = {name: default for name, (_, default, _, _) in self.spec.items()}
+        raw.update({name: os.environ[name] for name in self.spec if name in os.environ})
+        raw.update(self._read_file())
+        return raw
+
+    def validate(self, raw):
+        """Typed, range-checked copy of `raw`; raises ConfigError listing every problem."""
+        values, errors = {}, []
+        for name, value in raw.items():
+            if name not in self.spec:
+                errors.append(f"{name}: unknown setting")
+                continue
+            kind, _, lo, hi = self.spec[name]
+            try:
+                value = kind(value)
+            except (TypeError, ValueError):
+                errors.append(f"{name}: expected {kind.__name__}, got {value!r}")
+                continue
+            if not lo <= value <= hi:
+                errors.append(f"{name}: {value} is outside {lo}..{hi}")
+                continue
+            values[name] = value
+        if "RACE_MIN_SECONDS" in values and "RACE_MAX_SECONDS" in values \
+                and values["RACE_MIN_SECONDS"] > values["RACE_MAX_SECONDS"]:
+            errors.append("RACE_MIN_SECONDS must not exceed RACE_MAX_SECONDS")
+        if errors:
+            raise ConfigError("; ".join(errors))
+        return values
+
+    def subscribe(self, listener):
+        """Call `listener(changes)` with {name: new_value} after each applied change."""
+        with self.lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Stop calling `listener`; unknown listeners are ignored."""
+        with self.lock:
+            self._listeners = [l for l in self._listeners if l != listener]
+
+    def _apply(self, values):
+        with self.lock:
+            changes = {k: v for k, v in values.items() if self._values.get(k) != v}
+            self._values = values  # swapped whole, so readers never see a half-applied change
+        if changes:
+            logging.info(f"[Config] Applied {changes}")
+            for listener in list(self._listeners):
+                try:
+                    listener(changes)
+                except Exception as e:
+                    logging.error(f"[Config] Listener failed for {changes}: {e}")
+        return changes
+
+    def update(self, changes, persist=True):
+        """
+        Validate and apply `changes` ({name: value}); with `persist` they are
+        also written to the .env file so other processes pick them up.
+        Returns the settings that changed. Raises ConfigError.
+        """
+        fixed = sorted(name for name in changes if name in self.restart_only)
+        if fixed:
+            raise ConfigError("; ".join(f"{name}: only read at startup, set it in {self.env_file} and restart"
+                                        for name in fixed))
+        values = self.validate({**self._values, **changes})
+        if persist:
+            for name in changes:
+                set_key(self.env_file, name, str(values[name]), quote_mode="never")
+            self._read_file()  # our own write is not a change to reload
+        return self._apply(values)
+
+    def reload(self):
+        """Re-read the environment and .env file. Invalid files are logged and ignored."""
+        try:
+            values = self.validate(self._collect())
+        except ConfigError as e:
+            logging.error(f"[Config] Ignoring invalid {self.env_file}: {e}")
+            return {}
+        for name in self.restart_only:
+            if values[name] != self._values[name]:
+                logging.warning(f"[Config] {name}={values[name]} takes effect after a restart")
+                values[name] = self._values[name]
+        return self._apply(values)
+
+    def watch(self, interval=WATCH_INTERVAL_SECONDS):
+        """Start a background thread that reloads whenever the .env file changes."""
+        if self._watcher and self._watcher.is_alive():
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="ConfigWatcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                mtime = os.stat(self.env_file).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._file_mtime:
+                self.reload()
@@ -0,0 +1,167 @@
+import gzip
+import hashlib
+import os
+import threading
+
+from flask import request, render_template, abort
+
+COMPRESS_MIN_SIZE = 1024  # bytes; smaller bodies are not worth the CPU
+COMPRESS_LEVEL = 6
+COMPRESSIBLE_MIMETYPES = {
+    "application/json", "application/javascript", "text/html", "text/css",
+    "text/javascript", "text/plain",
+}
+ASSET_MAX_AGE = 365 * 24 * 3600  # hashed asset URLs never change content
+# Strong ETags must differ per representation, so gzip bodies get their own
+GZIP_ETAG_SUFFIX = "-gz"
+
+
+def _accepts_gzip():
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+
+def _compress_response(response):
+    """
+    Add an ETag (answering 304 when it matches) and gzip compressible
+    bodies above COMPRESS_MIN_SIZE. Streamed responses are left untouched.
+    """
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or "Content-Encoding" in response.headers):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    compress = _accepts_gzip() and not (
+        response.content_length is not None and response.content_length < COMPRESS_MIN_SIZE)
+
+    if request.method == "GET":
+        etag, weak = response.get_etag()
+        if not etag:
+            etag, weak = hashlib.sha1(response.get_data()).hexdigest(), False
+        response.set_etag(etag + GZIP_ETAG_SUFFIX if compress else etag, weak)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    if not compress:
+        return response
+    response.set_data(_gzip(response.get_data()))
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+class StaticAssets:
+    """
+    Content-hashed, precompressed copies of everything under static/, built
+    once on first use and served from memory with year-long cache headers.
+    `asset_url("css/styles.css")` -> "/assets/css/styles.<hash>.css".
+    """
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self.lock = threading.Lock()
+        self._urls = None  # logical path -> hashed path
+        self._files = None  # hashed path -> (mimetype, raw bytes, gzip bytes)
+
+    def _build(self):
+        import mimetypes
+        urls, files = {}, {}
+        for root, _, names in os.walk(self.static_folder):
+            for name in names:
+                full = os.path.join(root, name)
+                logical = os.path.relpath(full, self.static_folder).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()[:12]
+                base, ext = os.path.splitext(logical)
+                hashed = f"{base}.{digest}{ext}"
+                mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                urls[logical] = hashed
+                files[hashed] = (mimetype, data, _gzip(data) if mimetype in COMPRESSIBLE_MIMETYPES else None)
+        self._urls, self._files = urls, files
+
+    def _ensure_built(self):
+        if self._urls is None:
+            with self.lock:
+                if self._urls is None:
+                    self._build()
+
+    def url(self, logical_path):
+        self._ensure_built()
+        hashed = self._urls.get(logical_path)
+        if hashed is None:
+            return f"/static/{logical_path}"
+        return f"/assets/{hashed}"
+
+    def serve(self, app, hashed_path):
+        self._ensure_built()
+        entry = self._files.get(hashed_path)
+        if entry is None:
+            return abort(404)
+        mimetype, data, gz = entry
+        response = app.response_class(mimetype=mimetype)
+        etag = hashed_path
+        if gz is not None and _accepts_gzip():
+            response.set_data(gz)
+            response.headers["Content-Encoding"] = "gzip"
+            etag += GZIP_ETAG_SUFFIX
+        else:
+            response.set_data(data)
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = f"public, max-age={ASSET_MAX_AGE}, immutable"
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+
+class PageCache:
+    """
+    Pre-rendered templates that take no per-request data, kept as raw and
+    gzip bytes with an ETag so repeat visits revalidate to a 304.
+    Disabled in debug mode so template edits show up immediately.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._pages = {}
+
+    def render(self, app, template_name):
+        if app.debug:
+            return render_template(template_name)
+        page = self._pages.get(template_name)
+        if page is None:
+            data = render_template(template_name).encode("utf-8")
+            page = (data, _gzip(data), hashlib.sha256(data).hexdigest()[:16])
+            with self.lock:
+                self._pages[template_name] = page
+        data, gz, etag = page
+        response = app.response_class(mimetype="text/html")
+        if _accepts_gzip():
+            response.set_data(gz)
+            response.headers["Content-Encoding"] = "gzip"
+            etag += GZIP_ETAG_SUFFIX
+        else:
+            response.set_data(data)
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = "no-cache"  # always revalidate, usually a 304
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+
+def init_http_cache(app):
+    """Wire response compression, hashed static assets and page caching into `app`."""
+    assets = StaticAssets(app.static_folder)
+    app.extensions["static_assets"] = assets
+    app.extensions["page_cache"] = PageCache()
+
+    app.after_request(_compress_response)
+    app.add_url_rule("/assets/<path:hashed_path>", "hashed_asset",
+                     lambda hashed_path: assets.serve(app, hashed_path))
+    app.context_processor(lambda: {"asset_url": assets.url})
+
+
+def cached_page(app, template_name):
+    return app.extensions["page_cache"].render(app, template_name)
@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+POLL_INTERVAL = 0.005
+
+
+class InterProcessLock:
+    """
+    Exclusive lock shared by every thread of every process that opens the
+    same lock file. A thread lock serialises threads in this process (flock
+    is per open file, not per thread); flock on the file then serialises
+    processes. On platforms without fcntl it degrades to the thread lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = None
+        if hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: ref() and ref()._after_fork())
+
+    def _after_fork(self):
+        # An inherited descriptor shares the parent's flock, so it would not
+        # exclude the parent at all; the child opens its own on next use.
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock = threading.Lock()
+
+    def _file(self):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        return self._fd
+
+    def acquire(self, blocking=True, timeout=-1):
+        deadline = None if timeout is None or timeout < 0 else time.monotonic() + timeout
+        if not self._thread_lock.acquire(blocking, -1 if deadline is None else timeout):
+            return False
+        if fcntl is None:
+            return True
+        try:
+            if blocking and deadline is None:
+                fcntl.flock(self._file(), fcntl.LOCK_EX)
+                return True
+            while True:
+                try:
+                    fcntl.flock(self._file(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return True
+                except BlockingIOError:
+                    if not blocking or time.monotonic() >= deadline:
+                        self._thread_lock.release()
+                        return False
+                    time.sleep(POLL_INTERVAL)
+        except BaseException:
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self._file(), fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def locked(self):
+        return self._thread_lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class LeaderLease:
+    """
+    Non-blocking, process-lifetime flock used to elect the one process that
+    runs task runners and timers. The lease is released by the OS when the
+    holder exits, so another worker can take over.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def try_acquire(self):
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        return True
+
+    def is_held(self):
+        return self._fd is not None
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,22 @@
+from utils.profiler import TimedLock
+
+DEFAULT_STRIPES = 16
+
+
+class StripedLock:
+    """
+    Fixed pool of TimedLocks picked by hashing a key (task id, subscription
+    key). Work on one key is serialised while work on different keys rarely
+    shares a lock, without keeping a lock per key alive forever. With
+    stripes=1 it behaves like a single global lock.
+    """
+
+    def __init__(self, name, stripes=DEFAULT_STRIPES):
+        self.name = name
+        self._locks = [TimedLock(f"{name}[{i}]") for i in range(stripes)]
+
+    def __call__(self, key):
+        return self._locks[hash(key) % len(self._locks)]
+
+    def __len__(self):
+        return len(self._locks)
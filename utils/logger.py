@@ -8,18 +8,10 @@ LOG_FILE = "bot.log"
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3  # keep last 3 logs
 
-# === Ensure logs directory exists ===
-os.makedirs(LOG_DIR, exist_ok=True)
-
-# === Create logger ===
+# === Create logger (handlers are attached on first get_logger() call) ===
 logger = logging.getLogger("AutoTyperZ")
 logger.setLevel(logging.DEBUG)  # Set to INFO or WARNING for less verbosity
-
-# === Formatter with timestamps and log level ===
-formatter = logging.Formatter(
-    fmt="%(asctime)s | %(levelname)-8s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+_configured = False
 
 # === Console handler with color support ===
 class ColorConsoleHandler(logging.StreamHandler):
@@ -40,23 +32,37 @@ class ColorConsoleHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
-console_handler = ColorConsoleHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+def _configure():
+    # === Ensure logs directory exists ===
+    os.makedirs(LOG_DIR, exist_ok=True)
+
+    # === Formatter with timestamps and log level ===
+    formatter = logging.Formatter(
+        fmt="%(asctime)s | %(levelname)-8s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    )
+
+    console_handler = ColorConsoleHandler()
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
 
-# === File handler with rotating logs ===
-file_handler = RotatingFileHandler(
-    filename=os.path.join(LOG_DIR, LOG_FILE),
-    maxBytes=MAX_LOG_SIZE,
-    backupCount=BACKUP_COUNT,
-    encoding="utf-8"
-)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+    # === File handler with rotating logs ===
+    file_handler = RotatingFileHandler(
+        filename=os.path.join(LOG_DIR, LOG_FILE),
+        maxBytes=MAX_LOG_SIZE,
+        backupCount=BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    file_handler.setFormatter(formatter)
+    logger.addHandler(file_handler)
 
-# === Disable propagation to root logger ===
-logger.propagate = False
+    # === Disable propagation to root logger ===
+    logger.propagate = False
 
 # === Helper function to use logger globally ===
 def get_logger():
+    global _configured
+    if not _configured:
+        _configured = True
+        _configure()
     return logger
@@ -0,0 +1,195 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+MAX_PROFILE_SECONDS = 60
+DEFAULT_SAMPLE_INTERVAL = 0.005  # 5 ms, ~200 samples/s per thread
+
+# ==================== Lock Wait Instrumentation ====================
+
+_lock_registry = {}
+_lock_registry_lock = threading.Lock()
+
+
+class TimedLock:
+    """
+    Drop-in replacement for threading.Lock that records how long callers
+    wait for it. The uncontended path is a single non-blocking acquire, so
+    the clock is only read when a thread actually has to wait.
+    """
+
+    def __init__(self, name: str, lock=None):
+        self.name = name
+        self._lock = lock or threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        with _lock_registry_lock:
+            _lock_registry[name] = self
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        acquired = self._lock.acquire(True, timeout)
+        waited = time.perf_counter() - start
+        if acquired:
+            # Counters are only mutated while holding the lock
+            self.acquisitions += 1
+            self.contended += 1
+            self.total_wait += waited
+            if waited > self.max_wait:
+                self.max_wait = waited
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def stats(self):
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "total_wait_ms": round(self.total_wait * 1000, 3),
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "avg_wait_ms": round(self.total_wait * 1000 / self.contended, 3) if self.contended else 0.0,
+        }
+
+
+def lock_stats():
+    """Wait-time stats for every TimedLock created in this process."""
+    with _lock_registry_lock:
+        locks = list(_lock_registry.values())
+    return {lock.name: lock.stats() for lock in locks}
+
+
+# ==================== Sampling Profiler ====================
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(duration, interval=DEFAULT_SAMPLE_INTERVAL, thread_name=None):
+    """
+    Sample every thread's stack (or only `thread_name`'s) for `duration`
+    seconds. Returns a Counter of collapsed stacks ("root;...;leaf" -> samples).
+    """
+    duration = min(duration, MAX_PROFILE_SECONDS)
+    counts = Counter()
+    own_ident = threading.get_ident()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            name = names.get(ident, str(ident))
+            if thread_name is not None and name != thread_name:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return counts
+
+
+def format_collapsed(counts):
+    """Render sample counts in the collapsed format read by flamegraph.pl / speedscope."""
+    return "\n".join(f"{stack} {n}" for stack, n in counts.most_common()) + "\n"
+
+
+# ==================== Scoped cProfile ====================
+
+class _CProfileSession:
+    def __init__(self, target, deadline):
+        self.target = target
+        self.deadline = deadline
+        self.profiles = []
+        self.inflight = 0
+        self.skipped = 0
+        self.cond = threading.Condition()
+
+
+_session = None
+
+
+@contextmanager
+def profile_scope(name):
+    """
+    Wrap a unit of work (e.g. one runner iteration). While a cProfile
+    window targets `name` (or all scopes), the work runs under cProfile;
+    otherwise this costs one global read. Python 3.12+ allows only one
+    active cProfile per process, so overlapping scopes run unprofiled.
+    """
+    session = _session
+    if session is None or (session.target is not None and session.target != name) or time.monotonic() > session.deadline:
+        yield
+        return
+    import cProfile
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:  # "Another profiling tool is already active"
+        with session.cond:
+            session.skipped += 1
+        yield
+        return
+    with session.cond:
+        session.inflight += 1
+    try:
+        yield
+    finally:
+        profile.disable()
+        with session.cond:
+            session.profiles.append(profile)
+            session.inflight -= 1
+            session.cond.notify_all()
+
+
+def run_cprofile(duration, target=None, limit=40):
+    """
+    Profile every `profile_scope` (or only the one named `target`) for
+    `duration` seconds and return the cumulative-time report as text.
+    """
+    global _session
+    duration = min(duration, MAX_PROFILE_SECONDS)
+    session = _CProfileSession(target, time.monotonic() + duration)
+    _session = session
+    try:
+        time.sleep(duration)
+    finally:
+        _session = None
+    # Let scopes that started inside the window finish so they are reported
+    with session.cond:
+        session.cond.wait_for(lambda: session.inflight == 0, timeout=duration)
+        profiles = list(session.profiles)
+    skipped = f"{session.skipped} overlapping scope(s) ran unprofiled.\n" if session.skipped else ""
+    if not profiles:
+        return "No profiled scopes ran during the window.\n" + skipped
+    import io
+    import pstats
+    out = io.StringIO()
+    stats = pstats.Stats(profiles[0], stream=out)
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.sort_stats("cumulative").print_stats(limit)
+    return skipped + out.getvalue()
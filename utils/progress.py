@@ -0,0 +1,85 @@
+import logging
+import threading
+
+PROGRESS_FLUSH_SECONDS = 0.25
+
+
+class ProgressWriter:
+    """
+    Coalescing channel between task runners and the task store. Runners
+    publish field updates per task; a single writer thread merges everything
+    published within `flush_window` seconds (latest value wins per field)
+    and hands the batch to `flush_fn({task_id: fields})` in one call, so
+    store writes stay at one per window however many runners are active.
+    """
+
+    def __init__(self, flush_fn, flush_window=PROGRESS_FLUSH_SECONDS, name="ProgressWriter"):
+        self.flush_fn = flush_fn
+        self.flush_window = flush_window
+        self.name = name
+        self._pending = {}  # task_id -> merged fields not yet written
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # keeps batches in publish order
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()  # cuts the current window short on stop()
+        self._thread = None
+        self._running = False
+        self.events = 0
+        self.batches = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._running = True
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread after writing whatever is pending."""
+        with self._lock:
+            self._running = False
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def publish(self, task_id, **fields):
+        with self._lock:
+            self._pending.setdefault(task_id, {}).update(fields)
+            self.events += 1
+            running = self._running
+        self._wakeup.set()
+        if not running:
+            self.start()
+
+    def flush(self):
+        """Write everything pending now. Returns the number of tasks written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                self.flush_fn(batch)
+                self.batches += 1
+            except Exception as e:
+                logging.error(f"[{self.name}] Failed to write progress for {len(batch)} tasks: {e}")
+            return len(batch)
+
+    def stats(self):
+        with self._lock:
+            return {"events": self.events, "batches": self.batches, "pending_tasks": len(self._pending)}
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Let the window fill up before writing it out as one batch
+            self._stopping.wait(self.flush_window)
+            self._wakeup.clear()
+            self.flush()
+            with self._lock:
+                if not self._running:
+                    return
@@ -0,0 +1,150 @@
+import os
+import struct
+from array import array
+
+from utils.locks import StripedLock, DEFAULT_STRIPES
+
+RACE_DIR = "task_races"
+# timestamp (f64), wpm (f32), accuracy (f32), duration seconds (f32), attempt (u16): 22 bytes/race
+RECORD = struct.Struct("<dfffH")
+PERCENTILES = (50, 90, 99)
+_np = None  # numpy once imported, False if it is not installed
+
+
+class RaceSeries:
+    """
+    Per-task race results stored column-wise in typed arrays, a few bytes
+    per race instead of a JSON object per result.
+    """
+
+    def __init__(self):
+        self.ts = array("d")
+        self.wpm = array("f")
+        self.acc = array("f")
+        self.duration = array("f")
+        self.attempt = array("H")
+
+    def __len__(self):
+        return len(self.ts)
+
+    def append(self, ts, wpm, acc, duration, attempt=1):
+        self.ts.append(ts)
+        self.wpm.append(wpm)
+        self.acc.append(acc)
+        self.duration.append(duration)
+        self.attempt.append(min(attempt, 0xFFFF))
+
+    def rows(self):
+        return [
+            {"timestamp": t, "wpm": round(w, 2), "accuracy": round(a, 2), "duration": round(d, 2), "attempt": n}
+            for t, w, a, d, n in zip(self.ts, self.wpm, self.acc, self.duration, self.attempt)
+        ]
+
+    def summary(self):
+        """Mean/percentile WPM, accuracy distribution (per whole percent) and races per hour."""
+        count = len(self)
+        if not count:
+            return {"races": 0}
+        np = _numpy()
+        if np is not None:
+            wpm = np.frombuffer(self.wpm, dtype=np.float32)
+            acc = np.frombuffer(self.acc, dtype=np.float32)
+            wpm_pcts = np.percentile(wpm, PERCENTILES).tolist()
+            buckets, counts = np.unique(np.floor(acc).astype(np.int32), return_counts=True)
+            acc_dist = dict(zip(buckets.tolist(), counts.tolist()))
+            # accumulate in float64 like the pure-Python path; float32 sums drift on long tasks
+            wpm_mean, acc_mean = float(wpm.mean(dtype=np.float64)), float(acc.mean(dtype=np.float64))
+            total_duration = float(np.frombuffer(self.duration, dtype=np.float32).sum(dtype=np.float64))
+            retried = int((np.frombuffer(self.attempt, dtype=np.uint16) > 1).sum())
+        else:
+            ordered = sorted(self.wpm)
+            wpm_pcts = [_percentile(ordered, p) for p in PERCENTILES]
+            acc_dist = {}
+            for a in self.acc:
+                acc_dist[int(a)] = acc_dist.get(int(a), 0) + 1
+            wpm_mean, acc_mean = sum(self.wpm) / count, sum(self.acc) / count
+            total_duration = sum(self.duration)
+            retried = sum(1 for n in self.attempt if n > 1)
+
+        span_hours = (self.ts[-1] - self.ts[0]) / 3600
+        return {
+            "races": count,
+            "wpm_mean": round(wpm_mean, 2),
+            "wpm_min": round(min(self.wpm), 2),
+            "wpm_max": round(max(self.wpm), 2),
+            **{f"wpm_p{p}": round(v, 2) for p, v in zip(PERCENTILES, wpm_pcts)},
+            "accuracy_mean": round(acc_mean, 2),
+            "accuracy_distribution": {str(k): v for k, v in sorted(acc_dist.items())},
+            "races_per_hour": round(count / span_hours, 2) if span_hours > 0 else None,
+            "total_race_seconds": round(total_duration, 2),
+            "retried_races": retried,
+        }
+
+    def to_bytes(self):
+        return b"".join(RECORD.pack(*row) for row in zip(self.ts, self.wpm, self.acc, self.duration, self.attempt))
+
+    @classmethod
+    def from_bytes(cls, data):
+        series = cls()
+        usable = len(data) - len(data) % RECORD.size  # ignore a torn trailing record
+        for row in RECORD.iter_unpack(data[:usable]):
+            series.append(*row)
+        return series
+
+
+def _numpy():
+    """
+    numpy, imported on first summary rather than at startup (it costs more
+    than the rest of the app's imports). None when not installed; the
+    pure-Python summary is used instead.
+    """
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = False
+    return _np or None
+
+
+def _percentile(ordered, pct):
+    """Linear-interpolated percentile of an already sorted sequence (numpy's default method)."""
+    pos = (len(ordered) - 1) * pct / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+class RaceStore:
+    """Append-only binary race results per task: task_races/<task_id>.bin, locked per task id stripe."""
+
+    def __init__(self, race_dir=RACE_DIR, stripes=DEFAULT_STRIPES):
+        self.race_dir = race_dir
+        self.locks = StripedLock("race_store", stripes)
+        self._dir_ready = False
+
+    def _path(self, task_id):
+        return os.path.join(self.race_dir, f"{task_id}.bin")
+
+    def append(self, task_id, ts, wpm, acc, duration, attempt=1):
+        record = RECORD.pack(ts, wpm, acc, duration, min(attempt, 0xFFFF))
+        with self.locks(task_id):
+            if not self._dir_ready:
+                os.makedirs(self.race_dir, exist_ok=True)
+                self._dir_ready = True
+            with open(self._path(task_id), "ab") as f:
+                f.write(record)
+
+    def load(self, task_id):
+        try:
+            with open(self._path(task_id), "rb") as f:
+                return RaceSeries.from_bytes(f.read())
+        except FileNotFoundError:
+            return RaceSeries()
+
+    def remove(self, task_id):
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,97 @@
+import heapq
+import itertools
+import threading
+import time
+import logging
+
+
+class TaskScheduler:
+    """
+    Min-heap timer index of due times. A single background thread sleeps
+    until the earliest entry is due and hands it to `callback`, so the cost
+    of waiting does not grow with the number of scheduled items.
+    """
+
+    def __init__(self, callback, name="TaskScheduler"):
+        self.callback = callback
+        self.name = name
+        self._heap = []  # (due_ts, seq, item)
+        self._seq = itertools.count()
+        self._entries = {}  # item -> seq of its live heap entry
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._stopped = False  # set by stop(); schedule() no longer restarts the thread
+
+    def start(self):
+        with self._cond:
+            self._stopped = False
+            self._running = True  # also keeps a thread that is still winding down from a stop()
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop firing. Entries scheduled afterwards are kept but only fire after an explicit start()."""
+        with self._cond:
+            self._running = False
+            self._stopped = True
+            self._cond.notify_all()
+
+    def schedule(self, due_ts: float, item):
+        """Schedule (or reschedule) `item` to fire at epoch time `due_ts`."""
+        with self._cond:
+            seq = next(self._seq)
+            self._entries[item] = seq
+            heapq.heappush(self._heap, (due_ts, seq, item))
+            # Only wake the loop if the new entry is now the earliest one
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+            if self._stopped:
+                return
+        self.start()
+
+    def cancel(self, item) -> bool:
+        """Lazily cancel `item`; its heap entry is discarded when it surfaces."""
+        with self._cond:
+            return self._entries.pop(item, None) is not None
+
+    def next_due(self):
+        with self._cond:
+            self._discard_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def __contains__(self, item):
+        with self._cond:
+            return item in self._entries
+
+    def __len__(self):
+        with self._cond:
+            return len(self._entries)
+
+    def _discard_cancelled(self):
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    self._discard_cancelled()
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay > 0:
+                        self._cond.wait(delay)
+                        continue
+                    _, _, item = heapq.heappop(self._heap)
+                    del self._entries[item]
+                    break
+            try:
+                self.callback(item)
+            except Exception as e:
+                logging.error(f"[{self.name}] Callback failed for {item}: {e}")
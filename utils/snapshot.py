@@ -0,0 +1,47 @@
+import os
+import pickle
+
+SNAPSHOT_VERSION = 1
+HEADER_FIELDS = ("id", "status", "subscription_key", "start_at", "races_botted", "how_many_races")
+
+
+def task_header(task):
+    """The few fields the scheduler needs at startup, as a compact tuple."""
+    return tuple(task.get(field) for field in HEADER_FIELDS)
+
+
+def header_dict(header):
+    return dict(zip(HEADER_FIELDS, header))
+
+
+def _source_signature(source_path):
+    try:
+        st = os.stat(source_path)
+    except FileNotFoundError:
+        return None
+    # ctime and inode too: a same-size rewrite can land within one mtime tick
+    return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+
+def save_snapshot(snapshot_path, source_path, headers):
+    """
+    Write task header tuples to a binary snapshot, stamped with the task
+    store's stat signature so a stale snapshot is never trusted.
+    """
+    payload = (SNAPSHOT_VERSION, _source_signature(source_path), list(headers))
+    tmp = snapshot_path + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, snapshot_path)
+
+
+def load_snapshot(snapshot_path, source_path):
+    """Header tuples from the snapshot, or None if it is missing or stale."""
+    try:
+        with open(snapshot_path, "rb") as f:
+            version, signature, headers = pickle.load(f)
+    except (FileNotFoundError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if version != SNAPSHOT_VERSION or signature != _source_signature(source_path):
+        return None
+    return headers
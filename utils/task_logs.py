@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from utils.locks import StripedLock, DEFAULT_STRIPES
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends and compaction are only serialised in-process
+    fcntl = None
+
+TASK_LOG_DIR = "task_logs"
+MAX_TASK_LOG_ENTRIES = 500  # newest entries kept per task; the file is compacted at twice this
+MAX_TRACKED_LOGS = 256  # line counts cached for the most recently appended-to files
+
+
+class TaskLogStore:
+    """
+    Append-only per-task log files (task_logs/<task_id>.jsonl). Runners add
+    one line per event instead of rewriting the task record, and logs are
+    only read (hydrated) when someone asks for them. Each file is bounded
+    to roughly `max_entries` lines. Locks are striped by task id, so
+    runners appending to different tasks' files do not wait on each other.
+
+    Several worker processes may append to the same file: appends take a
+    shared flock on it and compaction an exclusive one, so no line written
+    by another process is lost when the file is rewritten. Line counts are
+    a per-process estimate kept for the last MAX_TRACKED_LOGS files only;
+    compaction recounts from the file itself.
+    """
+
+    def __init__(self, log_dir=TASK_LOG_DIR, max_entries=MAX_TASK_LOG_ENTRIES, stripes=DEFAULT_STRIPES):
+        self.log_dir = log_dir
+        self.max_entries = max_entries
+        self.locks = StripedLock("task_logs", stripes)
+        self._dir_ready = False
+        self._line_counts = OrderedDict()  # task_id -> lines in its file, least recently appended first
+        self._counts_lock = threading.Lock()
+
+    def _path(self, task_id):
+        return os.path.join(self.log_dir, f"{task_id}.jsonl")
+
+    def append(self, task_id, message, timestamp=None):
+        entry = {
+            "timestamp": timestamp or datetime.utcnow().isoformat() + "Z",
+            "message": message
+        }
+        line = json.dumps(entry) + "\n"
+        with self.locks(task_id):
+            if not self._dir_ready:
+                os.makedirs(self.log_dir, exist_ok=True)
+                self._dir_ready = True
+            path = self._path(task_id)
+            with self._counts_lock:
+                count = self._line_counts.pop(task_id, None)
+            if count is None:
+                count = self._count_lines(path)
+            self._append_line(path, line)
+            count += 1
+            if count >= 2 * self.max_entries:
+                count = self._compact(path)
+            with self._counts_lock:
+                self._line_counts[task_id] = count
+                while len(self._line_counts) > MAX_TRACKED_LOGS:
+                    self._line_counts.popitem(last=False)
+
+    def _append_line(self, path, line):
+        while True:
+            with open(path, "a", encoding="utf-8") as f:
+                if fcntl is None:
+                    f.write(line)
+                    return
+                fcntl.flock(f, fcntl.LOCK_SH)
+                # A compaction in another process may have swapped the file
+                # while we waited; write to the current one, not the old inode
+                try:
+                    current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    f.write(line)
+                    return
+
+    def _count_lines(self, path):
+        try:
+            with open(path, "rb") as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    def _compact(self, path):
+        """Rewrite the file keeping only the newest `max_entries` lines."""
+        with open(path, "r", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)  # held until the new file is in place
+                if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                    return self._count_lines(path)  # another process just compacted it
+            lines = f.readlines()[-self.max_entries:]
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as out:
+                out.writelines(lines)
+            os.replace(tmp, path)
+        return len(lines)
+
+    def read(self, task, limit=None):
+        """
+        Full log for a task record: entries stored inline by older versions
+        followed by the append-only file. `limit` keeps only the newest entries.
+        """
+        logs = list(task.get("logs", []))
+        path = self._path(task["id"])
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                logs.extend(json.loads(line) for line in f if line.strip())
+        if limit is not None:
+            logs = logs[-limit:]
+        return logs
+
+    def remove(self, task_id):
+        with self.locks(task_id), self._counts_lock:
+            self._line_counts.pop(task_id, None)
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+from array import array
+
+USAGE_FILE = "usage_rollups.json"
+RING_HOURS = 24 * 35  # five weeks of hourly buckets per key
+FIELDS = ("races", "tasks_started", "tasks_finished", "failures", "busy_seconds")
+_WIDTH = 1 + len(FIELDS)  # slot layout: [hour, *FIELDS]
+_FIELD_INDEX = {name: i + 1 for i, name in enumerate(FIELDS)}
+
+
+class UsageRollup:
+    """
+    Per-subscription-key hourly usage counters kept in fixed-size ring
+    buffers (one flat array('d') per key). Events update a single slot in
+    O(1); queries read at most RING_HOURS slots and never touch raw tasks.
+
+    Only the process that records events (the scheduler-lease holder)
+    saves; other processes just read, reloading when the file changes.
+    """
+
+    def __init__(self, usage_file=USAGE_FILE, ring_hours=RING_HOURS):
+        self.usage_file = usage_file
+        self.ring_hours = ring_hours
+        self.lock = threading.Lock()
+        self._rings = {}
+        self._loaded = False
+        self._dirty = False  # recorded events not yet saved
+        self._signature = None  # of the file as last loaded or saved
+
+    def _ring(self, key):
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = array("d", [-1.0] + [0.0] * len(FIELDS)) * self.ring_hours
+            self._rings[key] = ring
+        return ring
+
+    def _slot(self, ring, hour):
+        """Base offset of `hour`'s slot, recycling it if it still holds an older hour."""
+        base = (hour % self.ring_hours) * _WIDTH
+        if ring[base] != hour:
+            ring[base] = hour
+            for i in range(1, _WIDTH):
+                ring[base + i] = 0.0
+        return base
+
+    def record(self, key, field, amount=1, ts=None):
+        if not key:
+            return
+        hour = int((ts if ts is not None else time.time()) // 3600)
+        with self.lock:
+            self._ensure_loaded()
+            ring = self._ring(key)
+            ring[self._slot(ring, hour) + _FIELD_INDEX[field]] += amount
+            self._dirty = True
+
+    def query(self, key, start_ts, end_ts):
+        """
+        Hourly buckets for `key` between two epoch times (inclusive), plus
+        totals. Hours older than the ring's horizon are not available.
+        """
+        first = max(int(start_ts // 3600), int(time.time() // 3600) - self.ring_hours + 1)
+        last = int(end_ts // 3600)
+        buckets = []
+        totals = dict.fromkeys(FIELDS, 0)
+        with self.lock:
+            self._ensure_loaded()
+            ring = self._rings.get(key)
+            if ring is not None:
+                for hour in range(first, last + 1):
+                    base = (hour % self.ring_hours) * _WIDTH
+                    if ring[base] != hour:
+                        continue
+                    bucket = {name: ring[base + i] for name, i in _FIELD_INDEX.items()}
+                    for name in FIELDS:
+                        totals[name] += bucket[name]
+                    bucket["hour"] = hour * 3600
+                    buckets.append(bucket)
+        return {"buckets": buckets, "totals": totals}
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.usage_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_ctime_ns, st.st_size, st.st_ino)
+
+    def _ensure_loaded(self):
+        """Load on first use, and reload a read-only copy whenever another process saved."""
+        if self._loaded and (self._dirty or self._file_signature() == self._signature):
+            return
+        self._loaded = True
+        self._signature = self._file_signature()
+        if self._signature is None:
+            return
+        with open(self.usage_file, "r") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                return
+        self._rings = {}
+        for key, slots in data.items():
+            ring = self._ring(key)
+            for slot in slots:
+                hour = int(slot[0])
+                base = self._slot(ring, hour)
+                ring[base + 1:base + _WIDTH] = array("d", slot[1:])
+
+    def save(self):
+        """
+        Persist non-empty slots only, so the file stays proportional to real
+        usage. A no-op unless events were recorded here since the last save,
+        so a read-only process never overwrites the recorder's data.
+        """
+        with self.lock:
+            if not self._dirty:
+                return
+            data = {}
+            for key, ring in self._rings.items():
+                data[key] = [ring[base:base + _WIDTH].tolist()
+                             for base in range(0, len(ring), _WIDTH) if ring[base] >= 0]
+            tmp = f"{self.usage_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self.usage_file)
+            self._dirty = False
+            self._signature = self._file_signature()
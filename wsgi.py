@@ -0,0 +1,12 @@
+"""
+Production WSGI entry point:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every worker serves HTTP against the shared task store; the worker that
+holds the scheduler lease also runs task runners and timers (see
+app.dispatch_loop). Worker hooks live in gunicorn.conf.py.
+"""
+from app import app
+
+application = app